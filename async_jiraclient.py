@@ -0,0 +1,68 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from config import ASYNC_WORKERS, ISSUES_COUNT, ISSUES_PAGE_SIZE
+
+# methods of JiraClient which don't send requests
+LOCAL_METHODS = {
+    'permalink',
+    'format_date',
+    'get_remaining_estimate',
+    'get_original_estimate',
+    'get_transitions_key',
+    'invalidate_transitions',
+}
+
+
+class AsyncJiraClient:
+    """
+    JiraClient with the same methods as coroutines, so a task can await
+    many requests at once. The jira package is synchronous, so the requests
+    are sent by a small shared executor instead of a thread per request
+    """
+
+    def __init__(self, jira_client, workers=ASYNC_WORKERS):
+        self.jira_client = jira_client
+        self.executor = ThreadPoolExecutor(workers)
+
+    def __getattr__(self, name):
+        attribute = getattr(self.jira_client, name)
+        if name in LOCAL_METHODS or not callable(attribute):
+            return attribute
+        return partial(self.run, attribute)
+
+    async def run(self, call, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(call, *args, **kwargs))
+
+    async def iter_issue_pages(self, query='', limit=ISSUES_COUNT, start_at=0):
+        """
+        Yield pages of issues in order as soon as they are received.
+        When the first page tells the total, the rest of the pages
+        are requested concurrently
+        """
+
+        first_page = await self.get_issues(start_at, query, min(limit, ISSUES_PAGE_SIZE))
+        yield first_page
+        end = min(first_page.total, start_at + limit)
+        # the server could return less issues than we asked
+        page_size = len(first_page)
+        if not page_size or start_at + page_size >= end:
+            return
+
+        pages = [
+            asyncio.ensure_future(self.get_issues(
+                page_start,
+                query,
+                min(page_size, end - page_start)
+            ))
+            for page_start in range(start_at + page_size, end, page_size)
+        ]
+        try:
+            for page in pages:
+                yield await page
+        finally:
+            # the pages are not needed anymore if the caller has stopped
+            for page in pages:
+                page.cancel()
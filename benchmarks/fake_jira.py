@@ -0,0 +1,192 @@
+import copy
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+PAYLOADS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'payloads')
+REST_PATH = '/rest/api/2/'
+
+KEYS_PATTERN = re.compile(r'\bkey\s+in\s*\(([^)]*)\)', re.IGNORECASE)
+UPDATED_PATTERN = re.compile(r'\bupdated\s*>=\s*-(\d+)m', re.IGNORECASE)
+
+
+def load_payload(payloads_dir, name):
+    with open(os.path.join(payloads_dir, name), 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+class FakeJira:
+    """
+    Jira REST API stand-in which replays the recorded payloads for a project
+    with the given number of issues. Every request waits for the latency in ms
+    """
+
+    def __init__(self, issues_count=200, latency=100, project_key='JQR', payloads_dir=PAYLOADS_DIR):
+        self.latency = latency
+        issue = load_payload(payloads_dir, 'issue.json')
+        self.transitions = load_payload(payloads_dir, 'transitions.json')
+        self.resolutions = load_payload(payloads_dir, 'resolutions.json')
+        self.versions = load_payload(payloads_dir, 'versions.json')
+        # the newest issues are first like in the default filters
+        self.issues = dict()
+        for number in range(issues_count, 0, -1):
+            key = '{}-{}'.format(project_key, number)
+            raw_issue = copy.deepcopy(issue)
+            raw_issue['key'] = key
+            raw_issue['id'] = str(10000 + number)
+            raw_issue['fields']['summary'] = '{} {}'.format(issue['fields']['summary'], number)
+            self.issues[key] = raw_issue
+        self.worklogs = dict()
+        # time.monotonic() of the last change by issue key
+        self.updated = dict()
+        self.requests = []
+        self.lock = threading.Lock()
+        self.server = None
+
+    def start(self):
+        """
+        Start the server in a thread and return its url
+        """
+
+        fake_jira = self
+
+        class Handler(RequestHandler):
+            jira = fake_jira
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return 'http://127.0.0.1:{}'.format(self.server.server_port)
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get_requests_count(self):
+        with self.lock:
+            return len(self.requests)
+
+    def touch(self, key):
+        with self.lock:
+            self.updated[key] = time.monotonic()
+
+    def search(self, params):
+        jql = params.get('jql', [''])[0]
+        start_at = int(params.get('startAt', ['0'])[0])
+        max_results = int(params.get('maxResults', ['50'])[0])
+        fields = ','.join(params.get('fields', [])).split(',')
+
+        keys = list(self.issues)
+        keys_match = KEYS_PATTERN.search(jql)
+        if keys_match:
+            wanted = {key.strip() for key in keys_match.group(1).split(',')}
+            keys = [key for key in keys if key in wanted]
+        updated_match = UPDATED_PATTERN.search(jql)
+        if updated_match:
+            since = time.monotonic() - int(updated_match.group(1)) * 60
+            with self.lock:
+                keys = [key for key in keys if self.updated.get(key, 0) >= since]
+
+        page = []
+        for key in keys[start_at:start_at + max_results]:
+            raw_issue = self.issues[key]
+            page.append(dict(
+                raw_issue,
+                fields={
+                    name: value for name, value in raw_issue['fields'].items()
+                    if name in fields or '*all' in fields
+                }
+            ))
+        return dict(startAt=start_at, maxResults=max_results, total=len(keys), issues=page)
+
+    def get(self, path, params):
+        parts = path.split('/')
+        if path == 'search':
+            return 200, self.search(params)
+        if path == 'field':
+            return 200, []
+        if path == 'resolution':
+            return 200, self.resolutions
+        if parts[0] == 'project' and len(parts) == 3 and parts[2] == 'versions':
+            return 200, self.versions
+        if parts[0] == 'project' and len(parts) == 2:
+            return 200, dict(key=parts[1], name=parts[1])
+        if parts[0] == 'issue' and parts[1] in self.issues:
+            if len(parts) == 2:
+                return 200, self.issues[parts[1]]
+            if parts[2] == 'transitions':
+                return 200, self.transitions
+            if parts[2] == 'worklog':
+                with self.lock:
+                    worklogs = list(self.worklogs.get(parts[1], []))
+                return 200, dict(startAt=0, maxResults=len(worklogs), total=len(worklogs), worklogs=worklogs)
+        return 404, dict(errorMessages=['Not found: {}'.format(path)])
+
+    def post(self, path, body):
+        parts = path.split('/')
+        if path == 'search':
+            params = {name: value if isinstance(value, list) else [str(value)] for name, value in body.items()}
+            return 200, self.search(params)
+        if parts[0] == 'issue' and parts[1] in self.issues and len(parts) == 3:
+            self.touch(parts[1])
+            if parts[2] == 'worklog':
+                with self.lock:
+                    worklogs = self.worklogs.setdefault(parts[1], [])
+                    worklog = dict(body, id=str(len(worklogs) + 1))
+                    worklogs.append(worklog)
+                return 201, worklog
+            if parts[2] == 'comment':
+                return 201, dict(body, id='1')
+            if parts[2] == 'transitions':
+                return 204, None
+        return 404, dict(errorMessages=['Not found: {}'.format(path)])
+
+    def put(self, path, body):
+        parts = path.split('/')
+        if parts[0] == 'issue' and parts[1] in self.issues:
+            self.touch(parts[1])
+            return 204, None
+        return 404, dict(errorMessages=['Not found: {}'.format(path)])
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    jira = None
+    protocol_version = 'HTTP/1.1'
+
+    def handle_request(self, method):
+        url = urlsplit(self.path)
+        path = url.path[len(REST_PATH):] if url.path.startswith(REST_PATH) else url.path
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}') if length else {}
+        with self.jira.lock:
+            self.jira.requests.append((self.command, path))
+        time.sleep(self.jira.latency / 1000)
+
+        if method == 'GET':
+            status, payload = self.jira.get(path, parse_qs(url.query))
+        elif method == 'POST':
+            status, payload = self.jira.post(path, body)
+        else:
+            status, payload = self.jira.put(path, body)
+        data = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.handle_request('GET')
+
+    def do_POST(self):
+        self.handle_request('POST')
+
+    def do_PUT(self):
+        self.handle_request('PUT')
+
+    def log_message(self, *args):
+        pass
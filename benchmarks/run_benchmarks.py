@@ -0,0 +1,243 @@
+"""
+End-to-end timings of the main screen against a local fake jira.
+
+    python benchmarks/run_benchmarks.py --issues 200 --latency 100
+
+Every run is appended to benchmarks/results.jsonl and compared
+with the previous run with the same parameters
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASEDIR = os.path.dirname(BENCHMARKS_DIR)
+RESULTS_PATH = os.path.join(BENCHMARKS_DIR, 'results.jsonl')
+# longest time a scenario may take, in seconds
+SCENARIO_TIMEOUT = 120
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, BASEDIR)
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+import config  # noqa: E402
+
+# the app must not touch the files of the user,
+# so the paths are changed before the controllers import them
+TEMP_DIR = tempfile.mkdtemp(prefix='jqr-benchmarks-')
+config.ISSUES_CACHE_PATH = os.path.join(TEMP_DIR, 'issues_cache.sqlite3')
+config.OUTBOX_PATH = os.path.join(TEMP_DIR, 'outbox.sqlite3')
+config.FILTERS_PATH = os.path.join(TEMP_DIR, 'filters.ini')
+config.TRACE_PATH = os.path.join(TEMP_DIR, 'trace.jsonl')
+
+from fake_jira import FakeJira  # noqa: E402
+from controllers.main_controller import MainController  # noqa: E402
+from controllers.mixins import scheduler  # noqa: E402
+from jiraclient import JiraClient  # noqa: E402
+
+MY_ISSUES_QUERY = 'assignee = currentuser() and resolution = unresolved'
+OTHER_QUERY = 'project = JQR order by created desc'
+REPORT_ROW = '{:<24}{:>12}{:>12}{:>12}{:>10}{:>10}'
+
+
+def wait_for_tasks(app):
+    """
+    Process events until all tasks and their handlers are finished
+    """
+
+    deadline = time.monotonic() + SCENARIO_TIMEOUT
+    while scheduler.tasks:
+        if time.monotonic() > deadline:
+            raise TimeoutError('Tasks are not finished: {}'.format(len(scheduler.tasks)))
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+
+
+def measure(app, action):
+    started = time.perf_counter()
+    action()
+    wait_for_tasks(app)
+    return (time.perf_counter() - started) * 1000
+
+
+class Scenarios:
+    """
+    User actions on the main window, every method returns its time in ms
+    """
+
+    def __init__(self, app, controller, fake_jira):
+        self.app = app
+        self.controller = controller
+        self.fake_jira = fake_jira
+        self.logged_issues = 0
+        self.new_filters = 0
+
+    def switch_filter(self, query):
+        self.controller.current_filter = query
+        self.controller.refresh_issue_list(change_filter=True)
+
+    def refresh(self):
+        # the issues updated since the last refresh are requested
+        return measure(self.app, self.controller.refresh_issue_list)
+
+    def full_refresh(self):
+        def refresh():
+            self.controller.delta_sync.reset()
+            self.controller.refresh_issue_list()
+        return measure(self.app, refresh)
+
+    def load_more(self):
+        self.switch_filter(MY_ISSUES_QUERY)
+        wait_for_tasks(self.app)
+        return measure(self.app, lambda: self.controller.refresh_issue_list(load_more=True))
+
+    def quick_log(self):
+        # the worklog is sent by the outbox and the issue is refreshed
+        self.logged_issues += 1
+        key = self.controller.issue_keys[self.logged_issues % len(self.controller.issue_keys)]
+        self.controller.view.issue_list_model.set_draft(key, 'time_spent', '5m')
+        return measure(self.app, lambda: self.controller.log_work_from_list(key))
+
+    def switch_filter_cached(self):
+        self.switch_filter(OTHER_QUERY)
+        wait_for_tasks(self.app)
+        return measure(self.app, lambda: self.switch_filter(MY_ISSUES_QUERY))
+
+    def switch_filter_uncached(self):
+        # a filter which has not been opened yet has no saved issues
+        self.new_filters += 1
+        query = '{} and labels != benchmark-{}'.format(OTHER_QUERY, self.new_filters)
+        return measure(self.app, lambda: self.switch_filter(query))
+
+
+SCENARIOS = (
+    'refresh',
+    'full_refresh',
+    'load_more',
+    'quick_log',
+    'switch_filter_cached',
+    'switch_filter_uncached',
+)
+
+
+def run(issues_count, latency, repeat):
+    app = QApplication.instance() or QApplication([])
+    fake_jira = FakeJira(issues_count, latency)
+    url = fake_jira.start()
+    try:
+        controller = MainController(JiraClient('benchmark@example.com', 'token', server=url))
+        controller.show()
+        # like the app started with the saved credentials
+        controller.check_credentials()
+        wait_for_tasks(app)
+        # the list has as many issues as the fake jira
+        controller.issues_count = issues_count
+        controller.refresh_issue_list()
+        wait_for_tasks(app)
+        scenarios = Scenarios(app, controller, fake_jira)
+
+        results = dict()
+        for name in SCENARIOS:
+            timings = []
+            requests = []
+            for _ in range(repeat):
+                requests_count = fake_jira.get_requests_count()
+                timings.append(getattr(scenarios, name)())
+                requests.append(fake_jira.get_requests_count() - requests_count)
+            results[name] = dict(
+                median=round(statistics.median(timings), 1),
+                min=round(min(timings), 1),
+                max=round(max(timings), 1),
+                requests=max(requests)
+            )
+        return results
+    finally:
+        fake_jira.stop()
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BASEDIR,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous_run(path, parameters):
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            run_result = json.loads(line)
+            if run_result['parameters'] == parameters:
+                previous = run_result
+    return previous
+
+
+def report(results, previous, threshold):
+    """
+    Print the timings and return the names of the scenarios
+    which are slower than in the previous run by more than the threshold
+    """
+
+    regressions = []
+    print(REPORT_ROW.format('scenario', 'median, ms', 'min, ms', 'max, ms', 'requests', 'change'))
+    for name, timing in results.items():
+        change = ''
+        if previous is not None and name in previous['results']:
+            previous_median = previous['results'][name]['median']
+            ratio = timing['median'] / previous_median - 1 if previous_median else 0
+            change = '{:+.0%}'.format(ratio)
+            if ratio > threshold:
+                regressions.append(name)
+                change += ' !'
+        print(REPORT_ROW.format(
+            name, timing['median'], timing['min'], timing['max'], timing['requests'], change
+        ))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--issues', type=int, default=200, help='issues in the fake jira')
+    parser.add_argument('--latency', type=int, default=100, help='ms every request of the fake jira takes')
+    parser.add_argument('--repeat', type=int, default=5, help='runs of every scenario')
+    parser.add_argument('--results', default=RESULTS_PATH, help='JSONL file with the results of the runs')
+    parser.add_argument('--threshold', type=float, default=0.2, help='slowdown reported as a regression')
+    parser.add_argument('--check', action='store_true', help='exit with 1 if there are regressions')
+    args = parser.parse_args()
+
+    parameters = dict(issues=args.issues, latency=args.latency, repeat=args.repeat)
+    results = run(args.issues, args.latency, args.repeat)
+    previous = load_previous_run(args.results, parameters)
+    regressions = report(results, previous, args.threshold)
+
+    with open(args.results, 'a', encoding='utf-8') as file:
+        file.write(json.dumps(dict(
+            date=datetime.now().isoformat(timespec='seconds'),
+            commit=get_commit(),
+            parameters=parameters,
+            results=results
+        )) + '\n')
+    if regressions:
+        print('Slower than the previous run: {}'.format(', '.join(regressions)))
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,17 @@
+from functools import lru_cache
+
 from PyQt5.QtWidgets import QWidget, QApplication
 
 from config import QSS_PATH
 
 
+@lru_cache(maxsize=None)
+def load_qss():
+    # the style sheet is read when the first window is created
+    with open(QSS_PATH, 'r') as qss_file:
+        return qss_file.read()
+
+
 class CenterWindow(QWidget):
     def __init__(self):
         super().__init__()
@@ -17,5 +26,4 @@ class CenterWindow(QWidget):
         self.move(frame_gm.topLeft())
 
     def set_style(self):
-        with open(QSS_PATH, 'r') as qss_file:
-            self.setStyleSheet(qss_file.read())
+        self.setStyleSheet(load_qss())
@@ -10,18 +10,79 @@ LOGO_PATH = os.path.join(STATICDIR, 'logo.png')
 LOGGED_TIME_DIR = os.path.join(BASEDIR, 'log')
 DELETE_FILTER_ICON = os.path.join(STATICDIR, 'delete_icon.png')
 
-with open(QSS_PATH, 'r') as qss_file:
-    QSS = qss_file.read()
-
 # ms * min = 1 hour
 LOG_TIME = 60000 * 60
-# 1 minute
+# the issue list is refreshed every minute while it changes, the interval grows
+# by REFRESH_BACKOFF times while nothing changes or the window is hidden
 REFRESH_TIME = 60000
+MAX_REFRESH_TIME = 60000 * 10
+HIDDEN_REFRESH_TIME = 60000 * 10
+REFRESH_BACKOFF = 2
+# the next refresh after the changes of the user are sent
+CHANGES_REFRESH_TIME = 15000
+# part of the interval added or subtracted at random,
+# so the apps of a team don't refresh at the same time
+REFRESH_JITTER = 0.2
+# refetch the whole filter at least every 15 minutes,
+# otherwise ask only for the issues updated since the last refresh
+FULL_SYNC_TIME = 60000 * 15
+# minutes added to the 'updated' interval so that no change is missed
+DELTA_SYNC_OVERLAP = 1
 ISSUES_COUNT = 10
+# time tracking settings of jira, used to show the logged time before the refresh
+WORK_HOURS_PER_DAY = 8
+WORK_DAYS_PER_WEEK = 5
+# fields requested for the issue list, the rest of the issue json is not sent
+ISSUE_LIST_FIELDS = ('summary', 'timetracking', 'status', 'assignee', 'issuetype')
+# long lists are fetched by pages which are requested concurrently
+ISSUES_PAGE_SIZE = 50
+# threads which send the requests awaited by coroutines of the async client
+ASYNC_WORKERS = 4
+# transitions of every project, issue type and status are fetched in parallel
+TRANSITIONS_FETCH_WORKERS = 4
+# changes of different issues in the outbox are sent in parallel
+OUTBOX_SEND_WORKERS = 4
+
+# threads shared by all background tasks and limits of the tasks
+# using the same resource at a time
+WORKER_THREADS = 8
+TASK_RESOURCE_LIMITS = {
+    'issue_list': 1,
+    'filters': 1,
+    'outbox': 1,
+}
+
+# requests transport adapter which keeps connections to the jira server alive,
+# an HTTP/2 adapter can be set here if it is installed
+HTTP_ADAPTER = 'requests.adapters.HTTPAdapter'
+# enough connections for all the threads which send requests at a time
+HTTP_POOL_SIZE = WORKER_THREADS + ASYNC_WORKERS + TRANSITIONS_FETCH_WORKERS + OUTBOX_SEND_WORKERS
+
+# resolutions and versions of projects are loaded again in the background
+# when they are older than this
+METADATA_TTL = 60000 * 60
+
+# reads are retried with jittered exponential backoff (ms) or after the time
+# asked by the rate limit headers, until the deadline of the call (ms).
+# Writes are never retried
+READ_RETRIES = 4
+RETRY_BACKOFF = 500
+RETRY_MAX_BACKOFF = 8000
+READ_DEADLINE = 20000
 
 MAX_RETRIES = 0  # we need it because without it our app will not be
 # available (for 15 sec) in case of bad connection or IP blocking
 FILTERS_PATH = os.path.join(BASEDIR, 'filters.ini')
+ISSUES_CACHE_PATH = os.path.join(BASEDIR, 'issues_cache.sqlite3')
+# worklogs and workflow changes are saved here until they are sent
+OUTBOX_PATH = os.path.join(BASEDIR, 'outbox.sqlite3')
+# time to send the changes again after a connection error
+OUTBOX_FLUSH_TIME = 60000
+# spans of requests, tasks and view updates are exported to this file from the stats window
+TRACE_PATH = os.path.join(BASEDIR, 'trace.jsonl')
+# spans kept until they are exported and durations kept by span name for percentiles
+TRACE_SPANS_LIMIT = 10000
+TRACE_DURATIONS_LIMIT = 1000
 SEARCH_ITEM_NAME = 'search issues'
 MY_ISSUES_ITEM_NAME = 'my open issues'
 FILTERS_DEFAULT_SECTION_NAME = 'Filters'
@@ -29,6 +90,9 @@ DEFAULT_FILTERS = {SEARCH_ITEM_NAME: 'order by created desc',
                    MY_ISSUES_ITEM_NAME: 'assignee = currentuser() '
                                      'and resolution = unresolved'
                    }
+# saved filters are validated at startup or when they are selected first time
+VALIDATE_FILTERS_ON_START = True
+FILTER_VALIDATION_WORKERS = 4
 FILTER_FIELD_HELP_URL = 'https://confluence.atlassian.com/display/JIRASOFTWARECLOUD/Advanced+searching'
 
 SERVER = 'https://spherical.atlassian.net'
@@ -0,0 +1,70 @@
+import math
+import re
+import time
+
+from config import DELTA_SYNC_OVERLAP, FULL_SYNC_TIME
+
+ORDER_BY_PATTERN = re.compile(r'\border\s+by\b', re.IGNORECASE)
+
+
+class DeltaSync:
+    """
+    Remembers when every filter was synchronized last time
+    and builds queries for the issues updated since then.
+
+    Jira compares dates in JQL using the server clock and minute
+    precision, so we use a relative date ("updated >= -5m") with
+    an overlap instead of the local wall clock
+    """
+
+    def __init__(self):
+        self.last_sync = dict()
+        self.started = dict()
+
+    @staticmethod
+    def split_query(query):
+        """
+        Split JQL into the condition and the 'order by' clause
+        """
+
+        matches = list(ORDER_BY_PATTERN.finditer(query))
+        if not matches:
+            return query.strip(), ''
+        order_by_start = matches[-1].start()
+        return query[:order_by_start].strip(), query[order_by_start:].strip()
+
+    def begin(self, query):
+        """
+        Start synchronization of the filter and return the query for
+        the issues updated since the last sync, or None if all issues
+        of the filter have to be fetched
+        """
+
+        now = time.monotonic()
+        self.started[query] = now
+        last_sync = self.last_sync.get(query)
+        # FULL_SYNC_TIME is in ms as the other timers
+        if last_sync is None or (now - last_sync) * 1000 > FULL_SYNC_TIME:
+            return None
+
+        minutes = math.ceil((now - last_sync) / 60) + DELTA_SYNC_OVERLAP
+        condition, order_by = self.split_query(query)
+        updated_condition = 'updated >= -{}m'.format(minutes)
+        if condition:
+            return '({}) and {} {}'.format(condition, updated_condition, order_by).strip()
+        return '{} {}'.format(updated_condition, order_by).strip()
+
+    def commit(self, query):
+        """
+        Mark the filter synchronized at the time the sync has begun
+        """
+
+        started = self.started.pop(query, None)
+        if started is not None:
+            self.last_sync[query] = started
+
+    def reset(self, query=None):
+        if query is None:
+            self.last_sync.clear()
+        else:
+            self.last_sync.pop(query, None)
@@ -1,11 +1,14 @@
 import configparser
+from concurrent.futures import ThreadPoolExecutor
 
 from jira import JIRAError
+from requests.exceptions import ConnectionError, ReadTimeout
 
 from config import (
     FILTERS_PATH,
     FILTERS_DEFAULT_SECTION_NAME,
-    DEFAULT_FILTERS
+    DEFAULT_FILTERS,
+    FILTER_VALIDATION_WORKERS
 )
 
 
@@ -13,9 +16,11 @@ class IssueFiltersHandler:
     def __init__(self, jira_client):
         self.config = configparser.ConfigParser()
         self.items = dict()
+        self.invalid_filters = []
+        self.validated_filters = set(DEFAULT_FILTERS)
         self.jira_client = jira_client
 
-    def create_filters(self):
+    def load_filters(self):
         try:
             self.config.read(FILTERS_PATH)
         except configparser.Error:
@@ -24,15 +29,65 @@ class IssueFiltersHandler:
         self.set_default_section()
         self.write_to_ini()
         self.set_filters()
-        delete_filters = []
-
-        for filter_name, filter_query in self.items.items():
-            try:
-                self.jira_client.get_issues(query=filter_query)
-            except JIRAError:
-                delete_filters.append(filter_name)
-        for filter_name in delete_filters:
+
+    def validate_filters(self, filter_names=None):
+        """
+        Find saved filters with invalid queries, all of them
+        are checked concurrently. Invalid filters are deleted
+        in the main thread by delete_invalid_filters
+        """
+
+        if filter_names is None:
+            filter_names = list(self.items)
+        filters = [
+            (filter_name, self.items[filter_name])
+            for filter_name in filter_names
+            if filter_name in self.items and filter_name not in self.validated_filters
+        ]
+        if not filters:
+            return
+
+        with ThreadPoolExecutor(FILTER_VALIDATION_WORKERS) as executor:
+            results = executor.map(
+                self.is_valid_query,
+                [filter_query for filter_name, filter_query in filters]
+            )
+            for (filter_name, filter_query), is_valid in zip(filters, results):
+                if is_valid is None:
+                    # the filter is checked again when it is selected
+                    continue
+                self.validated_filters.add(filter_name)
+                if not is_valid:
+                    self.invalid_filters.append(filter_name)
+
+    def is_validated(self, filter_name):
+        return filter_name in self.validated_filters
+
+    def is_valid_query(self, filter_query):
+        """
+        Return None if the query could not be checked now
+        """
+
+        try:
+            self.jira_client.validate_query(filter_query)
+        except (ConnectionError, ReadTimeout):
+            return None
+        except JIRAError as ex:
+            # only a bad request means the query is invalid, the filter must not
+            # be deleted when jira is not available or rejects the credentials
+            if ex.status_code == 400:
+                return False
+            return None
+        return True
+
+    def delete_invalid_filters(self):
+        invalid_filters = [
+            filter_name for filter_name in self.invalid_filters if filter_name in self.items
+        ]
+        self.invalid_filters = []
+        for filter_name in invalid_filters:
             self.delete_filter(filter_name)
+        return invalid_filters
 
     def set_filters(self):
         self.items.clear()
@@ -54,6 +109,8 @@ class IssueFiltersHandler:
         self.write_to_ini()
 
     def add_filter(self, filter_name, filter_query):
+        # query of the new filter has been just checked by a search
+        self.validated_filters.add(filter_name)
         self.config[FILTERS_DEFAULT_SECTION_NAME][filter_name] = filter_query
         self.write_to_ini()
         self.set_filters()
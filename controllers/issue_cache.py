@@ -0,0 +1,71 @@
+import json
+import sqlite3
+import time
+
+from config import ISSUES_CACHE_PATH
+from issue_record import IssueRecord
+
+
+class IssueCache:
+    """
+    Keeps issue records of every filter in SQLite database
+    to show them at once while the filter is being refreshed.
+    The cache is optional, so database errors are treated as a cache miss
+    """
+
+    def __init__(self, path=ISSUES_CACHE_PATH):
+        self.path = path
+
+    def connect(self):
+        # every thread needs its own connection
+        connection = sqlite3.connect(self.path)
+        # the older versions saved transitions without their statuses
+        # in the issue_records table, so they are not read
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS issue_records_v2 ('
+            'filter TEXT PRIMARY KEY, '
+            'saved_at REAL NOT NULL, '
+            'issues TEXT NOT NULL)'
+        )
+        return connection
+
+    def load(self, filter_query):
+        """
+        Return the list of issue records saved for the filter or None
+        """
+
+        try:
+            connection = self.connect()
+            try:
+                row = connection.execute(
+                    'SELECT issues FROM issue_records_v2 WHERE filter = ?',
+                    (filter_query,)
+                ).fetchone()
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        try:
+            return [IssueRecord(*issue_row) for issue_row in json.loads(row[0])]
+        except (ValueError, TypeError):
+            return None
+
+    def save(self, filter_query, issues):
+        raw_issues = json.dumps(
+            [issue.to_row() for issue in issues],
+            separators=(',', ':')
+        )
+        try:
+            connection = self.connect()
+            try:
+                with connection:
+                    connection.execute(
+                        'INSERT OR REPLACE INTO issue_records_v2 VALUES (?, ?, ?)',
+                        (filter_query, time.time(), raw_issues)
+                    )
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            pass
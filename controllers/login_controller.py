@@ -29,11 +29,7 @@ class LoginController(ProcessWithThreadsMixin):
         token = self.view.token_field.text()
         try:
             self.jira_client = JiraClient(email, token)
-            self.jira_client.client.search_issues(
-                'assignee = currentUser()',
-                maxResults=1
-            )  # check if username is correct
-            # use search_issues because jira.current_user always return none
+            self.jira_client.check_credentials()
             if self.view.remember_me_btn.isChecked():
                 self.remember_me(email, token)
         except JIRAError:
@@ -56,7 +52,7 @@ class LoginController(ProcessWithThreadsMixin):
         if error_text:
             self.view.set_error_to_label(error_text)
         else:
-            main_controller = MainController(self.jira_client)
+            main_controller = MainController(self.jira_client, credentials_confirmed=True)
             main_controller.show()
             self.app.setQuitOnLastWindowClosed(False)
             self.view.close()
@@ -1,25 +1,45 @@
 import os
+from collections import deque
+from datetime import datetime
 from functools import partial
 
-from PyQt5.QtWidgets import QMessageBox, QInputDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QInputDialog
 from jira import JIRAError
 
-from config import REFRESH_TIME, ISSUES_COUNT
-from controllers.mixins import ProcessWithThreadsMixin
-from controllers.filters import IssueFiltersHandler
-from controllers.time_log_controller import TimeLogController, QuickTimeLog
-from controllers.workflow_controller import (
-    WorkflowController,
-    CompleteWorkflowController
+from async_jiraclient import AsyncJiraClient
+from config import ISSUES_COUNT, LOG_TIME, OUTBOX_FLUSH_TIME, VALIDATE_FILTERS_ON_START
+from controllers.delta_sync import DeltaSync
+from controllers.issue_cache import IssueCache
+from controllers.mixins import (
+    ProcessWithThreadsMixin,
+    raise_if_cancelled,
+    report_progress,
+    run_coroutine,
+    PRIORITY_BACKGROUND,
+    PRIORITY_USER,
+    ISSUE_LIST,
+    FILTERS,
+    OUTBOX
 )
+from controllers.filters import IssueFiltersHandler
+from controllers.optimistic import apply_changes, parse_duration
+from controllers.outbox import TRANSITION_ISSUE
+from controllers.outbox_controller import OutboxController
+from controllers.reconciliation import reconcile, INSERT, UPDATE
+from controllers.refresh_schedule import RefreshSchedule
+from jiraclient import RETRY_STATUS_CODES
 from main_window import MainWindow
-from pomodoro_window import PomodoroWindow
+from tracing import tracer
+
+# controllers and windows which are not on the first screen
+# are imported when they are opened, to start faster
 
 
 class MainController(ProcessWithThreadsMixin):
-    def __init__(self, jira_client):
+    def __init__(self, jira_client, credentials_confirmed=False):
         super().__init__()
         self.jira_client = jira_client
+        self.async_jira_client = AsyncJiraClient(jira_client)
         self.issues_count = 0
         self.current_filter = ''
         self.view = MainWindow(self)
@@ -27,134 +47,455 @@ class MainController(ProcessWithThreadsMixin):
         self.time_log_controller = None
         self.filters_handler = IssueFiltersHandler(self.jira_client)
         self.current_issues = {}
-        self.insert_issue_list = []
-        self.update_issue_list = []
-        self.delete_issue_list = []
+        # keys of the issues in the order they are shown
+        self.issue_keys = []
+        self.fingerprints = {}
+        self.delta_sync = DeltaSync()
+        self.issue_cache = IssueCache()
+        # operations are added by the tasks and applied to the view
+        # in the main thread by refresh_issue_list_widget
+        self.issue_operations = deque()
+        # changes of the outbox which have not been sent yet by issue key
+        self.pending_changes = {}
+        # issues with sent changes are shown again after the next refresh
+        self.stale_keys = set()
+        self.refresh_schedule = RefreshSchedule()
+        # set by the tasks when the shown issues are changed
+        self.issues_changed = False
         self.set_loading_indicator()
         self.error_messages_count = 0
+        self.outbox_controller = OutboxController(self, self.jira_client)
+        # set by the check of the saved credentials in the background,
+        # the outbox is not sent until they are confirmed
+        self.credentials_confirmed = credentials_confirmed
+        self.credentials_rejected = False
+        self.login_controller = None
+        self.stats_view = None
+        # worklogs of the filled rows by idempotency key which are reported
+        # when the outbox has tried to send them
+        self.logged_work = {}
+        self.rejected_work = []
 
     def show(self):
-        self.start_loading(self.filters_handler.create_filters, self.create_filters_handler)
+        self.filters_handler.load_filters()
+        # selecting the default filter shows its cached issues at once
+        self.view.show_filters(self.filters_handler.items)
+        self.view.show()
+        if VALIDATE_FILTERS_ON_START:
+            self.validate_filters()
+        # send changes which were saved when the app was closed,
+        # saved credentials are checked first by check_credentials
+        if self.outbox_controller.update_view() and self.credentials_confirmed:
+            self.outbox_controller.flush()
+
+    def check_credentials(self):
+        """
+        Check the saved credentials while the cached issues are shown.
+        The login window is opened if they are rejected
+        """
+
+        self.start_loading(
+            self.validate_credentials,
+            self.check_credentials_handler,
+            with_indicator=False
+        )
+
+    def validate_credentials(self):
+        try:
+            self.jira_client.check_credentials()
+        except JIRAError as ex:
+            # the app works offline, so only a rejection opens the login window
+            if ex.status_code is None or ex.status_code in RETRY_STATUS_CODES:
+                raise
+            self.credentials_rejected = True
+
+    def check_credentials_handler(self, error_text):
+        if self.credentials_rejected:
+            self.close_rejected()
+            return
+        if error_text:
+            # the app is offline, the credentials are checked again
+            # when the outbox tries to send the changes
+            if self.outbox_controller.update_view():
+                self.outbox_controller.view.timer_flush.start(OUTBOX_FLUSH_TIME)
+            return
+        self.credentials_confirmed = True
+        if self.outbox_controller.update_view():
+            self.outbox_controller.flush()
+
+    def close_rejected(self):
+        """
+        Stop all work with the rejected credentials and open the login window
+        """
+
+        from controllers.login_controller import LoginController
+        self.scheduler.cancel_tasks(self)
+        self.scheduler.cancel_tasks(self.outbox_controller)
+        self.view.timer_refresh.stop()
+        self.view.timer_log_work.stop()
+        self.outbox_controller.view.timer_flush.stop()
+        self.view.tray_icon.hide()
+        self.view.hide()
+        app = QApplication.instance()
+        app.setQuitOnLastWindowClosed(True)
+        self.login_controller = LoginController(app)
+        self.login_controller.show()
+
+    def validate_filters(self, filter_names=None):
+        self.start_loading(
+            partial(self.filters_handler.validate_filters, filter_names),
+            self.validate_filters_handler,
+            with_indicator=False,
+            priority=PRIORITY_BACKGROUND,
+            resource=FILTERS
+        )
 
     def load_more_issues(self, filter_query):
         issues = self.jira_client.get_issues(self.issues_count, filter_query)
-        new_issues_count = len(issues)
+        # issues could be shifted to the next page since the last refresh
+        issues = [issue for issue in issues if issue.key not in self.current_issues]
+        transitions = self.jira_client.get_transitions(issues)
+        raise_if_cancelled()
 
+        operations = []
         for index, issue in enumerate(issues):
-            self.current_issues[issue.key] = issue
-            issue_dict = self.get_issue_parameters(issue)
-            issue_dict['index'] = index + self.issues_count
-            self.insert_issue_list.append(issue_dict)
-
-        self.issues_count += new_issues_count
+            operations.append((INSERT, self.issues_count + index, issue))
+        self.set_current_issues(
+            [self.current_issues[key] for key in self.issue_keys] + issues
+        )
+        self.issue_operations.extend(self.get_view_operations(operations, transitions))
 
     def get_issues_list(self, filter_query, change_filter=False):
         if change_filter or self.issues_count < ISSUES_COUNT:
             limit = ISSUES_COUNT
         else:
             limit = self.issues_count
-        issues = self.jira_client.get_issues(0, filter_query, limit)
-
-        # create list of issues
-        for index, issue in enumerate(issues):
-            # if this is a new issue
-            if issue.key not in self.current_issues:
-                # add issue to the list of all available issues
-                self.current_issues[issue.key] = issue
-                issue_dict = self.get_issue_parameters(issue)
-                issue_dict['index'] = index
-                # add issue to the list for new issues
-                self.insert_issue_list.append(issue_dict)
-            # if issue has been changed
-            elif issue.raw['fields'] != self.current_issues[issue.key].raw['fields']:
-                self.current_issues[issue.key] = issue
-                issue_dict = self.get_issue_parameters(issue)
-                # add issue to the list for updated issues
-                self.update_issue_list.append(issue_dict)
-        # update count of all available issues
-        self.issues_count = len(self.current_issues)
-        # get list of deleted issues
-        self.delete_issue_list = [
-            self.get_issue_parameters(issue) for issue in self.current_issues.values() if issue not in issues
+        if change_filter or not self.current_issues:
+            self.delta_sync.reset(filter_query)
+        delta_query = self.delta_sync.begin(filter_query)
+        if delta_query is None:
+            issues = run_coroutine(self.get_issue_pages(filter_query, limit))
+        else:
+            issues = self.get_issues_delta(filter_query, delta_query, limit)
+
+        self.update_current_issues(issues)
+        self.delta_sync.commit(filter_query)
+        self.issue_cache.save(filter_query, issues)
+
+    async def get_issue_pages(self, filter_query, limit):
+        """
+        Get issues of the filter page by page. While the next pages
+        are loading, the received issues are shown in place of the current ones
+        """
+
+        issues = []
+        async for page in self.async_jira_client.iter_issue_pages(filter_query, limit):
+            issues.extend(page)
+            if len(issues) < min(page.total, limit):
+                received_keys = {issue.key for issue in issues}
+                self.update_current_issues(issues + [
+                    self.current_issues[key]
+                    for key in self.issue_keys if key not in received_keys
+                ])
+                report_progress()
+        return issues
+
+    def update_current_issues(self, issues):
+        """
+        Replace the current issues with the given ones
+        and add operations which change the view the same way
+        """
+
+        fingerprints = {issue.key: issue.fingerprint for issue in issues}
+        stale_keys = set(self.stale_keys)
+        current_fingerprints = {
+            key: None if key in stale_keys else fingerprint
+            for key, fingerprint in self.fingerprints.items()
+        }
+        operations = reconcile(self.issue_keys, current_fingerprints, issues, fingerprints)
+        # transitions are cached by status, so all issues keep them
+        # and only new statuses are requested
+        transitions = self.jira_client.get_transitions(issues)
+        # drop the result if a newer refresh has superseded this one
+        raise_if_cancelled()
+        self.set_current_issues(issues, fingerprints)
+        self.stale_keys -= stale_keys
+        if operations:
+            self.issues_changed = True
+        self.issue_operations.extend(self.get_view_operations(operations, transitions))
+
+    def set_current_issues(self, issues, fingerprints=None):
+        if fingerprints is None:
+            fingerprints = {issue.key: issue.fingerprint for issue in issues}
+        self.current_issues = {issue.key: issue for issue in issues}
+        self.issue_keys = [issue.key for issue in issues]
+        self.fingerprints = fingerprints
+        self.issues_count = len(self.issue_keys)
+
+    def clear_issues(self):
+        self.set_current_issues([])
+        self.issue_operations.clear()
+
+    def get_view_operations(self, operations, transitions):
+        """
+        Replace issues in the operations with the parameters shown by the view
+        """
+
+        view_operations = []
+        for operation in operations:
+            if operation[0] == INSERT:
+                row, issue = operation[1:]
+                issue_dict = self.get_issue_parameters(issue, transitions[issue.key])
+                view_operations.append((INSERT, row, issue_dict))
+            elif operation[0] == UPDATE:
+                issue = operation[1]
+                issue_dict = self.get_issue_parameters(issue, transitions[issue.key])
+                view_operations.append((UPDATE, issue_dict))
+            else:
+                view_operations.append(operation)
+        return view_operations
+
+    def get_issues_delta(self, filter_query, delta_query, limit):
+        """
+        Build the list of the filter issues from the cached issues
+        and the issues updated since the last refresh.
+        Keys of the filter are used to find removed and reordered issues
+        """
+
+        keys = self.jira_client.get_issue_keys(0, filter_query, limit)
+        updated_issues = self.jira_client.get_issues(0, delta_query, limit)
+        if updated_issues.total > len(updated_issues):
+            # too many changes, it's cheaper to get the whole filter
+            return self.jira_client.get_issues(0, filter_query, limit)
+        issues = {issue.key: issue for issue in updated_issues}
+
+        # issues could get into the filter without being updated
+        missing_keys = [
+            key for key in keys if key not in issues and key not in self.current_issues
+        ]
+        if missing_keys:
+            issues.update(
+                (issue.key, issue)
+                for issue in self.jira_client.get_issues_by_keys(missing_keys)
+            )
+        return [
+            issues.get(key) or self.current_issues[key]
+            for key in keys if key in issues or key in self.current_issues
         ]
-        # remove deleted issues from the list of all available issues
-        for issue in self.delete_issue_list:
-            del self.current_issues[issue['key']]
 
-        self.issues_count -= len(self.delete_issue_list)
+    def set_pending_changes(self, changes, sent_keys=()):
+        """
+        Show the changes of the outbox in the issue list before they are sent.
+        Failed changes are not shown. Rows of the sent changes keep
+        showing them until the refresh gets the issues from jira
+        """
+
+        pending_changes = dict()
+        for change in changes:
+            if change.error is None:
+                pending_changes.setdefault(change.issue_key, []).append(
+                    (change.action, change.params)
+                )
+        changed_keys = {
+            key for key in set(pending_changes) | set(self.pending_changes)
+            if pending_changes.get(key) != self.pending_changes.get(key)
+        }
+        self.stale_keys.update(changed_keys & set(sent_keys))
+        changed_keys -= set(sent_keys)
+        # tasks read the whole dict, so it is replaced at once
+        self.pending_changes = pending_changes
+        update_list = []
+        for key in changed_keys:
+            shown_issue = self.view.issue_list_model.get_issue(key)
+            if key in self.current_issues and shown_issue is not None:
+                update_list.append(
+                    self.get_issue_parameters(self.current_issues[key], shown_issue['workflow'])
+                )
+        self.view.update_issues(update_list)
 
-    def get_issue_parameters(self, issue):
-        workflow = self.jira_client.client.transitions(issue)
-        possible_workflow = {status['name']: status['id'] for status in workflow}
-        issue_dict = dict(
-            title=issue.fields.summary,
+    def get_issue_parameters(self, issue, workflow):
+        issue = apply_changes(issue, self.pending_changes.get(issue.key))
+        return dict(
+            title=issue.summary,
             key=issue.key,
-            link=issue.permalink(),
+            link=self.jira_client.permalink(issue),
             issue_obj=issue,
-            workflow=possible_workflow
+            workflow=workflow,
+            estimated=issue.original_estimate or '0m',
+            logged=issue.time_spent or '0m',
+            remaining=issue.remaining_estimate or '0m'
         )
 
-        # if the task was logged
-        if issue.fields.timetracking.raw:
-            timetracking = issue.fields.timetracking.raw
-            issue_dict.update({
-                'estimated': timetracking.get('originalEstimate', '0m'),
-                'logged': timetracking.get('timeSpent', '0m'),
-                'remaining': timetracking.get('remainingEstimate', '0m'),
-            })
-        else:
-            issue_dict.update({
-                'estimated': '0m',
-                'logged': '0m',
-                'remaining': '0m',
-            })
-        return issue_dict
-
-    def refresh_issue_list_widget(self, error):
+    def refresh_issue_list_widget(self, error, keep_issues=False):
+        if self.credentials_rejected:
+            # the login window is opened instead
+            return
+        self.schedule_refresh()
         if error:
             self.error_messages_count += 1
+            if keep_issues and self.issues_count:
+                # the shown rows and the typed time stay until the next refresh
+                if self.error_messages_count == 1:
+                    self.view.tray_icon.showMessage('Issues were not refreshed', error, msecs=2000)
+                return
             if self.error_messages_count == 1:
                 QMessageBox.about(self.view, 'Error', error)
-            self.current_issues.clear()
+            self.clear_issues()
             self.view.show_no_issues(error)
             return
         self.error_messages_count = 0
         if not self.issues_count:
+            self.issue_operations.clear()
             self.view.show_no_issues()
             return
+        self.show_issue_operations()
+        # the workflow windows of these issues will open without requests
+        self.jira_client.prefetch_metadata({key.split('-')[0] for key in self.issue_keys})
+
+    def schedule_refresh(self):
+        self.refresh_schedule.refreshed(self.issues_changed)
+        self.issues_changed = False
+        self.start_refresh_timer()
+
+    def start_refresh_timer(self):
+        self.view.timer_refresh.start(self.refresh_schedule.get_next_interval(
+            self.view.isVisible(),
+            self.jira_client.throttled_until
+        ))
+
+    def refresh_if_due(self):
+        # the list is refreshed rarely while the window is hidden
+        if self.refresh_schedule.is_due():
+            self.auto_refresh_issue_list()
+
+    def show_issue_operations(self):
         # if we have issues, make the widget for issues enable
-        self.view.issue_list_widget.show()
+        self.view.issue_list_view.show()
         self.view.label_info.hide()
-        if self.delete_issue_list:
-            self.view.delete_issues(self.delete_issue_list)
-        if self.update_issue_list:
-            self.view.update_issues(self.update_issue_list)
-        if self.insert_issue_list:
-            self.view.insert_issues(self.insert_issue_list)
-        self.insert_issue_list.clear()
-        self.update_issue_list.clear()
-        self.delete_issue_list.clear()
-        self.view.timer_refresh.start(REFRESH_TIME)
+        operations = []
+        while self.issue_operations:
+            operations.append(self.issue_operations.popleft())
+        self.view.apply_operations(operations)
 
     def refresh_issue_list(self, load_more=False, change_filter=False):
         if load_more:
             callback = partial(self.load_more_issues, self.current_filter)
+        elif change_filter and self.show_cached_issues(self.current_filter):
+            # cached issues are shown, so reconcile them without the indicator,
+            # the refresh of the previous filter is dropped
+            self.auto_refresh_issue_list(priority=PRIORITY_USER)
+            return
         else:
             callback = partial(self.get_issues_list, self.current_filter, change_filter)
-        self.start_loading(callback, self.refresh_issue_list_widget)
+        self.start_loading(
+            callback,
+            # rows of the previous filter are not kept if the new one fails
+            partial(self.refresh_issue_list_widget, keep_issues=not change_filter),
+            resource=ISSUE_LIST,
+            # loading more issues should not cancel the refresh of a new filter
+            group=None if load_more else ISSUE_LIST,
+            progress_callback=self.show_issue_operations
+        )
 
-    def auto_refresh_issue_list(self):
+    def show_cached_issues(self, filter_query):
+        """
+        Replace the issue list with the issues saved for the filter
+        last time. Return False if there is nothing in the cache
+        or the issue list is being refreshed now
+        """
+
+        if not self.scheduler.try_lock(ISSUE_LIST):
+            return False
+        try:
+            issues = self.issue_cache.load(filter_query)
+            tracer.count_cache('saved issue lists', bool(issues))
+            if not issues:
+                return False
+            self.clear_issues()
+            self.view.issue_list_model.clear()
+            # transitions are saved with the issues
+            transitions = {issue.key: issue.transitions or {} for issue in issues}
+            operations = [(INSERT, row, issue) for row, issue in enumerate(issues)]
+            self.set_current_issues(issues)
+            self.issue_operations.extend(self.get_view_operations(operations, transitions))
+            self.issues_changed = True
+        finally:
+            self.scheduler.unlock(ISSUE_LIST)
+        self.refresh_issue_list_widget(None)
+        return True
+
+    def auto_refresh_issue_list(self, priority=PRIORITY_BACKGROUND):
+        # the list is being refreshed already, so the timer doesn't repeat the search
+        if priority == PRIORITY_BACKGROUND and self.scheduler.has_tasks(ISSUE_LIST):
+            return
         callback = partial(self.get_issues_list, self.current_filter)
-        self.start_loading(callback, self.refresh_issue_list_widget, with_indicator=False)
+        self.start_loading(
+            callback,
+            partial(self.refresh_issue_list_widget, keep_issues=True),
+            with_indicator=False,
+            priority=priority,
+            resource=ISSUE_LIST,
+            group=ISSUE_LIST,
+            progress_callback=self.show_issue_operations
+        )
+
+    def refresh_issues(self, keys):
+        """
+        Get the given issues again and update only their rows
+        """
+
+        # jira could change other issues after the changes of the user
+        self.refresh_schedule.changes_sent()
+        self.start_refresh_timer()
+        keys = [key for key in keys if key in self.current_issues]
+        if not keys:
+            return
+        self.start_loading(
+            partial(self.update_issues, keys),
+            self.refresh_issues_handler,
+            with_indicator=False,
+            resource=ISSUE_LIST
+        )
+
+    def update_issues(self, keys):
+        issues = self.jira_client.get_issues_by_keys(keys)
+        # issues could be removed from the list while they were loading
+        issues = [issue for issue in issues if issue.key in self.current_issues]
+        changed_issues = [
+            issue for issue in issues
+            if issue.key in self.stale_keys or issue.fingerprint != self.fingerprints[issue.key]
+        ]
+        transitions = self.jira_client.get_transitions(issues)
+        raise_if_cancelled()
+
+        updated_issues = {issue.key: issue for issue in issues}
+        self.set_current_issues([
+            updated_issues.get(key) or self.current_issues[key] for key in self.issue_keys
+        ])
+        self.stale_keys -= set(updated_issues)
+        if changed_issues:
+            self.issues_changed = True
+        self.issue_operations.extend(self.get_view_operations(
+            [(UPDATE, issue) for issue in changed_issues],
+            transitions
+        ))
+
+    def refresh_issues_handler(self, error):
+        # the next refresh of the list will show the issues if they were not loaded
+        if not error and self.issues_count:
+            self.show_issue_operations()
 
     def change_workflow(self, workflow, issue_obj, new_status):
         self.issue = issue_obj
-        self.status_id = workflow.get(new_status)
+        transition = workflow.get(new_status)
+        self.status_id = transition[0] if transition else None
+        # the outbox checks the status before a transition is sent again
+        to_status = transition[1] if transition else None
         existing_estimate = self.jira_client.get_remaining_estimate(self.issue)
         original_estimate = self.jira_client.get_original_estimate(self.issue)
-        assignee = self.issue.fields.assignee.emailAddress
+        assignee = self.issue.assignee
         backlog_statuses = ['Backlog', 'Return to Backlog']
-        current_status = str(issue_obj.fields.status)
+        current_status = issue_obj.status
 
         if not self.status_id:
             return
@@ -165,22 +506,20 @@ class MainController(ProcessWithThreadsMixin):
             return
 
         elif new_status in ['Put on hold', 'Select for development']:
-            self.start_loading(
-                self.simple_workflow_change,
-                self.simple_workflow_change_handler
-            )
+            self.simple_workflow_change_handler(self.outbox_controller.add(
+                self.issue.key,
+                [(TRANSITION_ISSUE, dict(transition=self.status_id, status=to_status))]
+            ))
 
         elif new_status in ['Complete', 'Declare done']:
-            # open complete workflow window
-            self.complete_workflow_controller = CompleteWorkflowController(
-                self.jira_client,
-                self.issue,
-                new_status,
-                assignee,
-                self
+            # resolutions and versions are usually prefetched,
+            # otherwise the window is opened when they are loaded
+            self.start_loading(
+                partial(self.load_complete_workflow_metadata, self.issue),
+                partial(self.open_complete_workflow, self.issue, new_status, to_status, assignee)
             )
-            self.complete_workflow_controller.show()
         else:
+            from controllers.workflow_controller import WorkflowController
             self.workflow_controller = WorkflowController(
                 self.jira_client,
                 self.issue,
@@ -188,34 +527,45 @@ class MainController(ProcessWithThreadsMixin):
                 existing_estimate,
                 original_estimate,
                 assignee,
-                self
+                self,
+                to_status=to_status
             )
             self.workflow_controller.show()
 
-    def simple_workflow_change(self):
-        try:
-            self.jira_client.client.transition_issue(
-                    self.issue,
-                    transition=self.status_id
-                )
-        except JIRAError as e:
-            raise ValueError(e.text)
+    def load_complete_workflow_metadata(self, issue):
+        self.jira_client.get_possible_resolutions()
+        self.jira_client.get_possible_versions(issue)
+
+    def open_complete_workflow(self, issue, new_status, to_status, assignee, error_text):
+        if error_text:
+            QMessageBox.about(self.view, 'Error', error_text)
+            self.reset_workflow(issue)
+            return
+        from controllers.workflow_controller import CompleteWorkflowController
+        # the metadata is taken from the cache now
+        self.complete_workflow_controller = CompleteWorkflowController(
+            self.jira_client,
+            issue,
+            new_status,
+            assignee,
+            self,
+            to_status=to_status
+        )
+        self.complete_workflow_controller.show()
 
     def simple_workflow_change_handler(self, error):
         if error:
             QMessageBox.about(self.view, 'Error', error)
             self.reset_workflow(self.issue)
-        else:
-            self.refresh_issue_list()
 
     def get_possible_workflows(self, issue):
-        current_workflow = issue['issue_obj'].fields.status
+        current_workflow = issue['issue_obj'].status
         possible_workflows = list(issue['workflow'].keys())
 
-        if current_workflow.name != 'Backlog':  # when it's 'Backlog' status,
+        if current_workflow != 'Backlog':  # when it's 'Backlog' status,
             # JIRA API provides possibility to change it to 'Return to backlog'.
             # Cause it's the same that we already have we won't show it one more time
-            possible_workflows.insert(0, current_workflow.name)  # insert because of
+            possible_workflows.insert(0, current_workflow)  # insert because of
             # setCurrentIndex() can have only positive value
 
         return possible_workflows
@@ -234,6 +584,7 @@ class MainController(ProcessWithThreadsMixin):
                     'Another task in progress now!'
                 )
             return
+        from pomodoro_window import PomodoroWindow
         self.pomodoro_view = PomodoroWindow(
             self, issue_key,
             issue_title,
@@ -242,7 +593,15 @@ class MainController(ProcessWithThreadsMixin):
         self.pomodoro_view.show()
         self.pomodoro_view.log_work_if_file_exists()
 
+    def show_stats(self):
+        from stats_window import StatsWindow
+        if self.stats_view is None:
+            self.stats_view = StatsWindow()
+        self.stats_view.show_stats()
+        self.stats_view.show()
+
     def open_time_log(self, issue_key):
+        from controllers.time_log_controller import TimeLogController
         params = [self, self.jira_client, self.current_issues[issue_key]]
         if not self.pomodoro_view or not os.path.exists(self.pomodoro_view.LOG_PATH):
             params.append('0m')
@@ -262,6 +621,7 @@ class MainController(ProcessWithThreadsMixin):
         self.time_log_controller.view.show()
 
     def log_work_from_list(self, issue_key):
+        from controllers.time_log_controller import QuickTimeLog
         quick_time_log = QuickTimeLog(
             self,
             self.jira_client,
@@ -269,20 +629,95 @@ class MainController(ProcessWithThreadsMixin):
         )
         quick_time_log.save()
 
-    def create_filters_handler(self, error_text):
-        if error_text:
-            QMessageBox.warning(
-                None,
-                'Error',
-                error_text
-            )
-            self.quit_app()
-        else:
-            self.view.show_filters(self.filters_handler.items)
-            self.view.show()
+    def log_work_from_filled_rows(self):
+        """
+        Log the time typed in all rows of the issue list at once
+        """
+
+        from controllers.time_log_controller import create_log_work_change, INVALID_TIME_SPENT
+        # the work is logged now even if the worklogs are sent later
+        start_date = datetime.utcnow()
+        issue_changes = dict()
+        invalid_lines = []
+        for issue_key in self.issue_keys:
+            draft = self.view.get_issue_draft(issue_key)
+            time_spent = draft['time_spent'].strip()
+            if not time_spent:
+                continue
+            if parse_duration(time_spent) is None:
+                invalid_lines.append('{}: {}'.format(issue_key, INVALID_TIME_SPENT.format(time_spent)))
+                continue
+            issue_changes[issue_key] = [create_log_work_change(
+                self.jira_client,
+                time_spent,
+                draft['comment'],
+                start_date
+            )]
+        if invalid_lines:
+            # nothing is logged until all rows are correct
+            QMessageBox.about(self.view, 'Log work', '\n'.join(invalid_lines))
+            return
+        if not issue_changes:
+            QMessageBox.about(self.view, 'Log work', 'Type the time spent in the rows of the issues')
+            return
+
+        # the outbox sends the worklogs of different issues in parallel
+        # and refreshes all the issues with one search after that
+        saved_changes, error_text = self.outbox_controller.add_all(issue_changes)
+        saved_keys = set(saved_changes.values())
+        for issue_key in saved_keys:
+            self.view.clear_issue_draft(issue_key)
+        if saved_keys:
+            self.work_logged(saved_keys)
+        self.logged_work.update(saved_changes)
+        self.rejected_work.extend(
+            '{}: {}'.format(issue_key, error_text)
+            for issue_key in issue_changes if issue_key not in saved_keys
+        )
+        if not saved_changes:
+            self.report_logged_work([])
+
+    def work_logged(self, issue_keys):
+        self.view.timer_log_work.start(LOG_TIME)
+        if self.pomodoro_view and self.pomodoro_view.issue_key in issue_keys:
+            self.pomodoro_view.reset_timer()
+
+    def report_logged_work(self, changes):
+        """
+        Show which worklogs of the filled rows are sent when the outbox
+        has tried to send all of them
+        """
+
+        if not self.logged_work and not self.rejected_work:
+            return
+        if self.scheduler.has_tasks(OUTBOX):
+            # the worklogs could be added after the running flush has started
+            return
+        outbox_changes = {change.idempotency_key: change for change in changes}
+        lines = []
+        for idempotency_key, issue_key in self.logged_work.items():
+            change = outbox_changes.get(idempotency_key)
+            if change is None:
+                lines.append('{}: logged'.format(issue_key))
+            elif change.error is not None:
+                lines.append('{}: {}'.format(issue_key, change.error))
+            else:
+                lines.append('{}: will be sent when the connection is back'.format(issue_key))
+        lines.extend(self.rejected_work)
+        self.logged_work.clear()
+        self.rejected_work.clear()
+        QMessageBox.about(self.view, 'Log work', '\n'.join(lines))
+
+    def validate_filters_handler(self, error_text):
+        # connection errors are already shown by the issue list
+        if not error_text:
+            self.view.remove_filters(self.filters_handler.delete_invalid_filters())
 
     def search_issues_by_filter_name(self, filter_name):
-        self.current_filter = self.filters_handler.get_filter_by_name(filter_name.lower())
+        filter_name = filter_name.lower()
+        if not self.filters_handler.is_validated(filter_name):
+            self.validate_filters([filter_name])
+        self.current_filter = self.filters_handler.get_filter_by_name(filter_name)
         self.refresh_issue_list(change_filter=True)
         self.view.query_field.setText(self.current_filter)
 
@@ -339,7 +774,7 @@ class MainController(ProcessWithThreadsMixin):
 
     def save_filter(self, is_existing=False):
         self.current_filter = self.view.query_field.text().lower()
-        started_callback = partial(self.jira_client.get_issues, query=self.current_filter)
+        started_callback = partial(self.jira_client.validate_query, self.current_filter)
         if is_existing:
             finished_callback = self.existing_filter_saving_process
         else:
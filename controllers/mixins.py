@@ -1,59 +1,291 @@
-from PyQt5.QtCore import Qt, QMutex, QThread, pyqtSignal
+import asyncio
+import threading
+from functools import partial
+
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 from jira import JIRAError
 from pyqtspinner.spinner import WaitingSpinner
 from requests.exceptions import ConnectionError, ReadTimeout
 
+from config import WORKER_THREADS, TASK_RESOURCE_LIMITS
+from tracing import tracer, get_callback_name
+
+# user actions are taken from the queue before background refreshes
+PRIORITY_BACKGROUND = 0
+PRIORITY_USER = 1
+
+# tasks which rebuild the issue list share the state of MainController
+ISSUE_LIST = 'issue_list'
+FILTERS = 'filters'
+OUTBOX = 'outbox'
+
+# how often a coroutine of a task checks whether the task is cancelled, in ms
+CANCEL_CHECK_TIME = 50
+
+current_task = threading.local()
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+def raise_if_cancelled():
+    """
+    Stop the current task if it has been superseded.
+    Call it before changing any shared state
+    """
+
+    task = getattr(current_task, 'task', None)
+    if task is not None and task.cancelled:
+        raise TaskCancelled()
+
+
+def report_progress():
+    """
+    Call the progress callback of the current task in the main thread
+    """
 
-class Thread(QThread):
-    finished = pyqtSignal(str)
+    task = getattr(current_task, 'task', None)
+    if task is not None:
+        task.signals.progress.emit()
 
-    def __init__(self, callback, mutex):
+
+def run_coroutine(coroutine):
+    """
+    Run the coroutine in the thread of the current task and return its result.
+    When the task is cancelled, the requests it awaits are dropped
+    """
+
+    return asyncio.run(cancel_with_task(coroutine))
+
+
+async def cancel_with_task(coroutine):
+    future = asyncio.ensure_future(coroutine)
+    while not future.done():
+        try:
+            raise_if_cancelled()
+        except TaskCancelled:
+            future.cancel()
+            raise
+        await asyncio.wait([future], timeout=CANCEL_CHECK_TIME / 1000)
+    return future.result()
+
+
+class TaskSignals(QObject):
+    finished = pyqtSignal(object)
+    cancelled = pyqtSignal()
+    progress = pyqtSignal()
+
+
+class Task(QRunnable):
+    def __init__(self, callback, resource=None, priority=PRIORITY_USER, owner=None):
         super().__init__()
-        self.error_text = None
+        # the scheduler keeps tasks until they are finished
+        self.setAutoDelete(False)
         self.callback = callback
-        self.mutex = mutex
+        self.resource = resource
+        # set when the task is given a slot of its resource
+        self.has_slot = False
+        self.priority = priority
+        self.owner = owner
+        self.cancelled = False
+        self.signals = TaskSignals()
 
     def run(self):
-        self.mutex.lock()
+        current_task.task = self
         try:
-            self.callback()
-            self.error_text = None
+            raise_if_cancelled()
+            # superseded tasks are not failed
+            name = 'task.{}'.format(get_callback_name(self.callback))
+            with tracer.span(name, ignored=(TaskCancelled,)):
+                self.callback()
+            error_text = None
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+            return
         except (ConnectionError, ReadTimeout):
-            self.error_text = 'Connection error!\nPlease, check your internet connection'
+            error_text = 'Connection error!\nPlease, check your internet connection'
         except JIRAError as ex:
-            self.error_text = ex.text
+            error_text = ex.text
         except Exception as ex:
-            self.error_text = str(ex)
+            error_text = str(ex)
         finally:
-            self.mutex.unlock()
-            self.finished.emit(self.error_text)
+            current_task.task = None
+        self.signals.finished.emit(error_text)
 
+    def cancel(self):
+        self.cancelled = True
 
-class ProcessWithThreadsMixin:
-    mutex = QMutex()
+
+class LoadingIndicator(WaitingSpinner):
+    """
+    Spinner which is shown while at least one of its tasks is running
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.tasks_count = 0
+
+    def start(self):
+        self.tasks_count += 1
+        if self.tasks_count == 1:
+            super().start()
+
+    def stop(self):
+        self.tasks_count = max(self.tasks_count - 1, 0)
+        if not self.tasks_count:
+            super().stop()
+
+
+class TaskScheduler:
+    """
+    Shared pool of worker threads.
+    Tasks that use the same resource are limited by TASK_RESOURCE_LIMITS,
+    the tasks waiting for a resource are kept by the scheduler and don't
+    take threads of the pool. A new task of a group supersedes the tasks
+    of this group with the same or lower priority.
+    Resources are taken and released in the main thread
+    """
 
     def __init__(self):
-        self.finish_thread_callback = None
-        self.thread_list = []
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(WORKER_THREADS)
+        self.free_slots = dict(TASK_RESOURCE_LIMITS)
+        # tasks waiting for a slot of the resource in the order they were submitted
+        self.waiting = {resource: [] for resource in TASK_RESOURCE_LIMITS}
+        self.groups = dict()
+        self.tasks = set()
+
+    def submit(
+            self,
+            callback,
+            finished_callback,
+            cancelled_callback,
+            priority=PRIORITY_USER,
+            resource=None,
+            group=None,
+            progress_callback=None,
+            owner=None
+    ):
+        if resource not in self.free_slots:
+            resource = None
+        task = Task(callback, resource, priority, owner)
+        task.signals.finished.connect(partial(self.task_done, task, finished_callback))
+        task.signals.cancelled.connect(partial(self.task_done, task, cancelled_callback))
+        if progress_callback is not None:
+            task.signals.progress.connect(progress_callback)
+        if group is not None:
+            for queued_task in list(self.groups.setdefault(group, [])):
+                if queued_task.priority <= priority:
+                    self.cancel(queued_task)
+            self.groups[group].append(task)
+        self.tasks.add(task)
+        if resource is None:
+            self.pool.start(task, priority)
+        else:
+            self.waiting[resource].append(task)
+            self.start_waiting(resource)
+        return task
+
+    def start_waiting(self, resource):
+        waiting = self.waiting[resource]
+        while waiting and self.free_slots[resource]:
+            # user actions go first, otherwise the first submitted task
+            task = max(waiting, key=lambda waiting_task: waiting_task.priority)
+            waiting.remove(task)
+            self.free_slots[resource] -= 1
+            task.has_slot = True
+            self.pool.start(task, task.priority)
+
+    def release(self, task):
+        if task.has_slot:
+            task.has_slot = False
+            self.free_slots[task.resource] += 1
+            self.start_waiting(task.resource)
+
+    def cancel(self, task):
+        task.cancel()
+        # a task which has not been started yet is removed from the queue,
+        # a running task will stop at the next raise_if_cancelled call
+        if task.resource is not None and task in self.waiting[task.resource]:
+            self.waiting[task.resource].remove(task)
+            task.signals.cancelled.emit()
+        elif self.pool.tryTake(task):
+            task.signals.cancelled.emit()
+
+    def cancel_tasks(self, owner):
+        """
+        Cancel all tasks started by the controller
+        """
+
+        for task in list(self.tasks):
+            if task.owner is owner:
+                self.cancel(task)
+
+    def task_done(self, task, callback, *args):
+        if task not in self.tasks:
+            return
+        self.tasks.discard(task)
+        self.release(task)
+        for group_tasks in self.groups.values():
+            if task in group_tasks:
+                group_tasks.remove(task)
+        callback(*args)
+
+    def has_tasks(self, group):
+        return bool(self.groups.get(group))
+
+    def try_lock(self, resource):
+        if not self.free_slots[resource]:
+            return False
+        self.free_slots[resource] -= 1
+        return True
+
+    def unlock(self, resource):
+        self.free_slots[resource] += 1
+        self.start_waiting(resource)
+
+
+scheduler = TaskScheduler()
+
+
+class ProcessWithThreadsMixin:
+    scheduler = scheduler
 
     def set_loading_indicator(self):
-        self.indicator = WaitingSpinner(
+        self.indicator = LoadingIndicator(
             self.view,
             True,
             True,
             Qt.ApplicationModal
         )
 
-    def start_loading(self, started_callback, finished_callback, with_indicator=True):
-        self.finish_thread_callback = finished_callback
+    def start_loading(
+            self,
+            started_callback,
+            finished_callback,
+            with_indicator=True,
+            priority=PRIORITY_USER,
+            resource=None,
+            group=None,
+            progress_callback=None
+    ):
         if with_indicator:
             self.indicator.start()
-        thread = Thread(started_callback, self.mutex)
-        thread.finished.connect(self.stop_loading)
-        thread.start()
-        self.thread_list.append(thread)
-
-    def stop_loading(self, error_text):
-        self.indicator.stop()
-        self.thread_list = [thread for thread in self.thread_list if not thread.isFinished()]
-        self.finish_thread_callback(error_text)
+        return self.scheduler.submit(
+            started_callback,
+            partial(self.stop_loading, finished_callback, with_indicator),
+            partial(self.stop_loading, None, with_indicator),
+            priority=priority,
+            resource=resource,
+            group=group,
+            progress_callback=progress_callback,
+            owner=self
+        )
+
+    def stop_loading(self, finished_callback, with_indicator, error_text=None):
+        if with_indicator:
+            self.indicator.stop()
+        if finished_callback is not None:
+            with tracer.span('handler.{}'.format(get_callback_name(finished_callback))):
+                finished_callback(error_text)
@@ -0,0 +1,98 @@
+import re
+
+from config import WORK_HOURS_PER_DAY, WORK_DAYS_PER_WEEK
+from controllers.outbox import LOG_WORK, UPDATE_ISSUE, TRANSITION_ISSUE
+
+DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*([wdhm])')
+DURATION_UNITS = (
+    ('w', 60 * WORK_HOURS_PER_DAY * WORK_DAYS_PER_WEEK),
+    ('d', 60 * WORK_HOURS_PER_DAY),
+    ('h', 60),
+    ('m', 1),
+)
+
+
+def parse_duration(text):
+    """
+    Return minutes of a jira duration like '1d 2h 30m' or None
+    """
+
+    text = (text or '').strip().lower()
+    if not text:
+        return None
+    units = dict(DURATION_UNITS)
+    minutes = 0
+    end = 0
+    for match in DURATION_PATTERN.finditer(text):
+        if text[end:match.start()].strip():
+            return None
+        minutes += float(match.group(1)) * units[match.group(2)]
+        end = match.end()
+    if not end or text[end:].strip():
+        return None
+    return round(minutes)
+
+
+def format_duration(minutes):
+    parts = []
+    for unit, unit_minutes in DURATION_UNITS:
+        count, minutes = divmod(minutes, unit_minutes)
+        if count:
+            parts.append('{}{}'.format(count, unit))
+    return ' '.join(parts) or '0m'
+
+
+def add_durations(text, minutes):
+    current = parse_duration(text) or 0
+    return format_duration(max(current + minutes, 0))
+
+
+def apply_changes(issue, changes):
+    """
+    Return a copy of the issue record with the changes which have not
+    been sent yet, so the issue list shows them before the refresh
+    """
+
+    if not changes:
+        return issue
+    time_spent = issue.time_spent
+    original_estimate = issue.original_estimate
+    remaining_estimate = issue.remaining_estimate
+    status = issue.status
+    transitions = issue.transitions
+    for action, params in changes:
+        if action == LOG_WORK:
+            spent = parse_duration(params['time_spent'])
+            if spent is None:
+                continue
+            time_spent = add_durations(time_spent, spent)
+            adjust_estimate = params.get('adjust_estimate')
+            if adjust_estimate == 'new':
+                remaining_estimate = params['new_estimate']
+            elif adjust_estimate == 'manual':
+                remaining_estimate = add_durations(
+                    remaining_estimate,
+                    -(parse_duration(params['reduce_by']) or 0)
+                )
+            elif remaining_estimate:
+                # jira reduces the estimate by the logged time by default
+                remaining_estimate = add_durations(remaining_estimate, -spent)
+        elif action == UPDATE_ISSUE:
+            timetracking = params['fields'].get('timetracking', {})
+            original_estimate = timetracking.get('originalEstimate', original_estimate)
+            remaining_estimate = timetracking.get('remainingEstimate', remaining_estimate)
+        elif action == TRANSITION_ISSUE:
+            if params.get('status'):
+                status = params['status']
+                continue
+            # transitions are given by id or by name
+            for name, (transition_id, to_status) in (transitions or {}).items():
+                if params['transition'] in (transition_id, name):
+                    status = to_status or name
+                    break
+    return issue.replace(
+        status=status,
+        original_estimate=original_estimate,
+        remaining_estimate=remaining_estimate,
+        time_spent=time_spent
+    )
@@ -0,0 +1,97 @@
+import json
+import sqlite3
+import time
+import uuid
+from collections import namedtuple
+
+from config import OUTBOX_PATH
+
+LOG_WORK = 'log_work'
+ADD_COMMENT = 'add_comment'
+UPDATE_ISSUE = 'update_issue'
+TRANSITION_ISSUE = 'transition_issue'
+
+Change = namedtuple(
+    'Change',
+    ['id', 'idempotency_key', 'issue_key', 'action', 'params', 'attempts', 'error']
+)
+
+
+class Outbox:
+    """
+    SQLite journal of changes which are sent to jira in the background.
+    A change is saved here before it is sent and is removed
+    when jira has accepted it, so nothing is lost without connection
+    """
+
+    def __init__(self, path=OUTBOX_PATH):
+        self.path = path
+
+    def connect(self):
+        # every thread needs its own connection
+        connection = sqlite3.connect(self.path)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS changes ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'idempotency_key TEXT NOT NULL UNIQUE, '
+            'issue_key TEXT NOT NULL, '
+            'action TEXT NOT NULL, '
+            'params TEXT NOT NULL, '
+            'created_at REAL NOT NULL, '
+            'attempts INTEGER NOT NULL DEFAULT 0, '
+            'error TEXT)'
+        )
+        return connection
+
+    def execute(self, *queries):
+        connection = self.connect()
+        try:
+            with connection:
+                cursor = None
+                for query in queries:
+                    cursor = connection.execute(*query)
+                return cursor.fetchall()
+        finally:
+            connection.close()
+
+    def add(self, issue_key, changes):
+        """
+        Save changes [(action, params)] of the issue in one transaction.
+        They are sent in the given order. Return idempotency keys of the changes
+        """
+
+        created_at = time.time()
+        idempotency_keys = [uuid.uuid4().hex for _ in changes]
+        self.execute(*(
+            (
+                'INSERT INTO changes '
+                '(idempotency_key, issue_key, action, params, created_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (idempotency_key, issue_key, action, json.dumps(params), created_at)
+            )
+            for idempotency_key, (action, params) in zip(idempotency_keys, changes)
+        ))
+        return idempotency_keys
+
+    def get_changes(self):
+        rows = self.execute((
+            'SELECT id, idempotency_key, issue_key, action, params, attempts, error '
+            'FROM changes ORDER BY id',
+        ))
+        return [
+            Change(change_id, key, issue_key, action, json.loads(params), attempts, error)
+            for change_id, key, issue_key, action, params, attempts, error in rows
+        ]
+
+    def start_attempt(self, change_id):
+        # saved before the request, so a lost response can be checked later
+        self.execute(('UPDATE changes SET attempts = attempts + 1 WHERE id = ?', (change_id,)))
+
+    def remove(self, change_id):
+        self.execute(('DELETE FROM changes WHERE id = ?', (change_id,)))
+
+    def set_error(self, change_id, error):
+        self.execute(('UPDATE changes SET error = ? WHERE id = ?', (error, change_id)))
+
+    def clear_errors(self):
+        self.execute(('UPDATE changes SET error = NULL',))
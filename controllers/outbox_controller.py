@@ -0,0 +1,201 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from jira import JIRAError
+from requests.exceptions import ConnectionError, ReadTimeout
+
+from config import OUTBOX_FLUSH_TIME, OUTBOX_SEND_WORKERS
+from controllers.mixins import ProcessWithThreadsMixin, PRIORITY_BACKGROUND, OUTBOX
+from controllers.outbox import Outbox, LOG_WORK, ADD_COMMENT, UPDATE_ISSUE, TRANSITION_ISSUE
+from jiraclient import RETRY_STATUS_CODES
+from outbox_window import OutboxWindow
+
+
+class OutboxController(ProcessWithThreadsMixin):
+    """
+    Saves worklogs and workflow changes to the outbox at once
+    and sends them to jira in the background
+    """
+
+    def __init__(self, main_controller, jira_client):
+        super().__init__()
+        self.main_controller = main_controller
+        self.jira_client = jira_client
+        self.outbox = Outbox()
+        self.view = OutboxWindow(self)
+        # ids of failed changes which the user has been told about
+        self.failed_ids = set()
+        self.sent_issue_keys = set()
+
+    def show(self):
+        self.update_view()
+        self.view.show()
+
+    def add(self, issue_key, changes):
+        """
+        Save changes [(action, params)] of the issue and start sending them.
+        Return the error text if they could not be saved
+        """
+
+        return self.add_all({issue_key: changes})[1]
+
+    def add_all(self, issue_changes):
+        """
+        Save changes of several issues {issue key: [(action, params)]}
+        and start sending them together. Return {idempotency key: issue key}
+        of the saved changes and the error text if the rest were not saved
+        """
+
+        saved_changes = dict()
+        error_text = None
+        for issue_key, changes in issue_changes.items():
+            try:
+                idempotency_keys = self.outbox.add(issue_key, changes)
+            except sqlite3.Error as ex:
+                error_text = 'Changes were not saved: {}'.format(ex)
+                break
+            saved_changes.update(dict.fromkeys(idempotency_keys, issue_key))
+        if saved_changes:
+            self.update_view()
+            self.flush()
+        return saved_changes, error_text
+
+    def flush(self):
+        self.view.timer_flush.stop()
+        if not self.main_controller.credentials_confirmed:
+            # a rejected token would fail every change, so the changes
+            # are sent when the credentials are confirmed
+            self.main_controller.check_credentials()
+            return
+        self.start_loading(
+            self.send_changes,
+            self.flush_handler,
+            with_indicator=False,
+            priority=PRIORITY_BACKGROUND,
+            resource=OUTBOX,
+            group=OUTBOX
+        )
+
+    def send_changes(self):
+        issue_changes = dict()
+        for change in self.outbox.get_changes():
+            issue_changes.setdefault(change.issue_key, []).append(change)
+        with ThreadPoolExecutor(OUTBOX_SEND_WORKERS) as executor:
+            errors = list(executor.map(self.send_issue_changes, issue_changes.values()))
+        # the server is not available, so the rest are sent later
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def send_issue_changes(self, changes):
+        """
+        Send changes of one issue in order. Return the connection error
+        which has stopped them or None
+        """
+
+        for change in changes:
+            if change.error is not None:
+                # the next changes of the issue wait until
+                # the failed one is retried or discarded
+                return None
+            self.outbox.start_attempt(change.id)
+            try:
+                self.send_change(change)
+            except (ConnectionError, ReadTimeout) as ex:
+                return ex
+            except JIRAError as ex:
+                # errors without a status code come from the jira library,
+                # for example a transition name which is not found
+                if ex.status_code in RETRY_STATUS_CODES:
+                    return ex
+                self.outbox.set_error(change.id, ex.text or str(ex))
+                return None
+            self.outbox.remove(change.id)
+            self.sent_issue_keys.add(change.issue_key)
+        return None
+
+    def send_change(self, change):
+        params = change.params
+        if change.action == LOG_WORK:
+            # the worklog could be created before the response was lost
+            if change.attempts and self.jira_client.is_work_logged(
+                    change.issue_key, change.idempotency_key):
+                return
+            self.jira_client.log_work(
+                change.issue_key,
+                idempotency_key=change.idempotency_key,
+                **params
+            )
+        elif change.action == ADD_COMMENT:
+            if change.attempts and self.jira_client.is_comment_added(
+                    change.issue_key, change.idempotency_key):
+                return
+            self.jira_client.add_comment(
+                change.issue_key,
+                params['comment'],
+                idempotency_key=change.idempotency_key
+            )
+        elif change.action == UPDATE_ISSUE:
+            self.jira_client.update_issue(change.issue_key, fields=params['fields'])
+        elif change.action == TRANSITION_ISSUE:
+            # the transition could be made before the response was lost,
+            # changes of the older versions have no status
+            if change.attempts and params.get('status') and \
+                    self.jira_client.get_status(change.issue_key) == params['status']:
+                return
+            try:
+                self.jira_client.transition_issue(
+                    change.issue_key,
+                    params['transition'],
+                    fields=params.get('fields')
+                )
+            except JIRAError:
+                # the workflow could be changed, so the cached transitions are outdated
+                self.jira_client.invalidate_transitions(change.issue_key)
+                raise
+
+    def flush_handler(self, error_text):
+        sent_issue_keys = set(self.sent_issue_keys)
+        self.sent_issue_keys.clear()
+        changes = self.update_view(sent_issue_keys)
+        if sent_issue_keys:
+            # one search for all issues with sent changes
+            self.main_controller.refresh_issues(sent_issue_keys)
+        self.main_controller.report_logged_work(changes)
+        if error_text and changes:
+            # connection errors are not shown, the changes are sent later
+            self.view.timer_flush.start(OUTBOX_FLUSH_TIME)
+        failed_ids = {change.id for change in changes if change.error is not None}
+        if failed_ids - self.failed_ids:
+            self.main_controller.view.tray_icon.showMessage(
+                'Changes were not saved',
+                'Open the outbox to see the errors',
+                msecs=2000
+            )
+        self.failed_ids = failed_ids
+
+    def update_view(self, sent_issue_keys=()):
+        try:
+            changes = self.outbox.get_changes()
+        except sqlite3.Error:
+            changes = []
+        self.view.show_changes(changes)
+        self.main_controller.set_pending_changes(changes, sent_issue_keys)
+        self.main_controller.view.set_outbox_count(
+            len(changes),
+            sum(change.error is not None for change in changes)
+        )
+        return changes
+
+    def retry(self):
+        self.outbox.clear_errors()
+        self.failed_ids.clear()
+        self.update_view()
+        self.flush()
+
+    def discard(self, change_id):
+        self.outbox.remove(change_id)
+        self.failed_ids.discard(change_id)
+        self.update_view()
+        # the next changes of the issue can be sent now
+        self.flush()
@@ -0,0 +1,131 @@
+from bisect import bisect_left
+
+INSERT = 'insert'
+UPDATE = 'update'
+MOVE = 'move'
+DELETE = 'delete'
+
+
+def get_stable_keys(keys, positions):
+    """
+    Return the longest sequence of keys which are already
+    in the right order, so that they don't need to be moved
+    """
+
+    tails = []
+    tail_indexes = []
+    previous = [None] * len(keys)
+    for index, key in enumerate(keys):
+        position = positions[key]
+        tail = bisect_left(tails, position)
+        if tail:
+            previous[index] = tail_indexes[tail - 1]
+        if tail == len(tails):
+            tails.append(position)
+            tail_indexes.append(index)
+        else:
+            tails[tail] = position
+            tail_indexes[tail] = index
+
+    stable_keys = set()
+    index = tail_indexes[-1] if tail_indexes else None
+    while index is not None:
+        stable_keys.add(keys[index])
+        index = previous[index]
+    return stable_keys
+
+
+class RowCounter:
+    """
+    Fenwick tree of occupied slots, which counts occupied slots
+    before a slot in O(log n)
+    """
+
+    def __init__(self, size):
+        self.tree = [0] * (size + 1)
+
+    def add(self, slot, value):
+        slot += 1
+        while slot < len(self.tree):
+            self.tree[slot] += value
+            slot += slot & -slot
+
+    def count_before(self, slot):
+        count = 0
+        while slot:
+            count += self.tree[slot]
+            slot -= slot & -slot
+        return count
+
+
+def get_slots(order, new_keys, stable_keys):
+    """
+    Place the current and the new places of the keys in one sequence.
+    Between two stable keys the new places go first in the new order,
+    then the current places of the keys which are moved from there
+    """
+
+    new_slots = dict()
+    current_slots = dict()
+    slot = 0
+    moved = iter(order)
+    for key in new_keys + [None]:
+        if key is not None and key not in stable_keys:
+            new_slots[key] = slot
+            slot += 1
+            continue
+        # the gap before the stable key ends, its moved keys are placed after the new places
+        for current_key in moved:
+            if current_key == key:
+                break
+            current_slots[current_key] = slot
+            slot += 1
+        if key is not None:
+            new_slots[key] = current_slots[key] = slot
+            slot += 1
+    return current_slots, new_slots, slot
+
+
+def reconcile(current_keys, current_fingerprints, issues, fingerprints):
+    """
+    Compare the shown keys with the fetched issues and return
+    operations which turn one list into another.
+    Changed issues are found by fingerprints of the current
+    and the fetched issues, no requests are made.
+    Operations are:
+    (DELETE, key), (INSERT, row, issue), (MOVE, key, row), (UPDATE, issue).
+    Operations have to be applied in the given order,
+    rows are counted at the moment the operation is applied
+    """
+
+    new_keys = [issue.key for issue in issues]
+    positions = {key: position for position, key in enumerate(new_keys)}
+    operations = [(DELETE, key) for key in current_keys if key not in positions]
+
+    order = [key for key in current_keys if key in positions]
+    stable_keys = get_stable_keys(order, positions)
+    current_slots, new_slots, slots_count = get_slots(order, new_keys, stable_keys)
+    rows = RowCounter(slots_count)
+    for key in order:
+        rows.add(current_slots[key], 1)
+    for issue in issues:
+        if issue.key in stable_keys:
+            continue
+        is_moved = issue.key in current_fingerprints
+        if is_moved:
+            rows.add(current_slots[issue.key], -1)
+        # the issue is put right after the issue which precedes it in the new list,
+        # this place doesn't change when the following issues are placed
+        row = rows.count_before(new_slots[issue.key])
+        rows.add(new_slots[issue.key], 1)
+        if is_moved:
+            operations.append((MOVE, issue.key, row))
+        else:
+            operations.append((INSERT, row, issue))
+
+    operations.extend(
+        (UPDATE, issue) for issue in issues
+        if issue.key in current_fingerprints
+        and current_fingerprints[issue.key] != fingerprints[issue.key]
+    )
+    return operations
@@ -0,0 +1,44 @@
+import random
+import time
+
+from config import (
+    REFRESH_TIME,
+    MAX_REFRESH_TIME,
+    HIDDEN_REFRESH_TIME,
+    REFRESH_BACKOFF,
+    CHANGES_REFRESH_TIME,
+    REFRESH_JITTER
+)
+
+
+class RefreshSchedule:
+    """
+    Chooses when the issue list is refreshed next time. The interval grows
+    while the issues don't change or the window is hidden and gets short
+    after the user's changes are sent. All intervals are in ms
+    """
+
+    def __init__(self):
+        self.interval = REFRESH_TIME
+        self.last_refresh = None
+
+    def refreshed(self, changed):
+        self.last_refresh = time.monotonic()
+        if changed:
+            self.interval = REFRESH_TIME
+        else:
+            self.interval = min(self.interval * REFRESH_BACKOFF, MAX_REFRESH_TIME)
+
+    def changes_sent(self):
+        self.interval = CHANGES_REFRESH_TIME
+
+    def is_due(self):
+        # the list is not older than the usual interval when the window is opened
+        return self.last_refresh is None or (time.monotonic() - self.last_refresh) * 1000 > REFRESH_TIME
+
+    def get_next_interval(self, visible, throttled_until=0):
+        interval = self.interval if visible else max(self.interval, HIDDEN_REFRESH_TIME)
+        interval *= random.uniform(1 - REFRESH_JITTER, 1 + REFRESH_JITTER)
+        # the server asked to wait for the rate limit
+        throttled_time = (throttled_until - time.monotonic()) * 1000
+        return int(max(interval, throttled_time))
@@ -1,14 +1,26 @@
-from functools import partial
+from datetime import datetime
 
 from PyQt5.QtWidgets import QMessageBox
-from PyQt5.QtCore import Qt
 
-from config import LOG_TIME
 from controllers.mixins import ProcessWithThreadsMixin
+from controllers.optimistic import parse_duration
+from controllers.outbox import LOG_WORK
 from time_log_window import TimeLogWindow
 from main_window import MainWindow
 
 
+INVALID_TIME_SPENT = 'Time spent "{}" should look like 1h 30m'
+
+
+def create_log_work_change(jira_client, time_spent, comment, start_date, **log_work_params):
+    return LOG_WORK, dict(
+        time_spent=time_spent,
+        start_date=jira_client.format_date(start_date),
+        comment=comment,
+        **log_work_params
+    )
+
+
 class TimeLogController(ProcessWithThreadsMixin):
     def __init__(self, main_controller, jira_client, issue, time_spent=None):
         super().__init__()
@@ -59,17 +71,22 @@ class TimeLogController(ProcessWithThreadsMixin):
             return False
         return True
 
+    def get_log_work_change(self):
+        return create_log_work_change(
+            self.jira_client,
+            self.time_spent,
+            self.comment,
+            self.start_date,
+            **self.log_work_params
+        )
+
     def save(self):
         if self.get_timelog_parameters():
-            save_callback = partial(
-                self.jira_client.log_work,
-                self.issue,
-                self.time_spent,
-                self.start_date,
-                self.comment,
-                **self.log_work_params
-            )
-            self.start_loading(save_callback, self.save_handler)
+            # the worklog is sent by the outbox, the issue list is refreshed after that
+            self.save_handler(self.main_controller.outbox_controller.add(
+                self.issue.key,
+                [self.get_log_work_change()]
+            ))
 
     def save_handler(self, error):
         if error:
@@ -77,11 +94,7 @@ class TimeLogController(ProcessWithThreadsMixin):
         else:
             if not isinstance(self.view, MainWindow):
                 self.view.close()
-            self.main_controller.refresh_issue_list()
-            self.main_controller.view.timer_log_work.start(LOG_TIME)
-            if self.main_controller.pomodoro_view and \
-                    self.main_controller.pomodoro_view.issue_key == self.issue.key:
-                self.main_controller.pomodoro_view.reset_timer()
+            self.main_controller.work_logged([self.issue.key])
 
 
 class QuickTimeLog(TimeLogController):
@@ -90,16 +103,17 @@ class QuickTimeLog(TimeLogController):
         self.indicator = self.main_controller.indicator
 
     def get_timelog_parameters(self):
-        issue_item = self.view.issue_list_widget.findItems(
-            self.issue.key, Qt.MatchExactly
-        )[0]
-        self.issue_widget = self.view.issue_list_widget.itemWidget(issue_item)
-        self.time_spent = self.issue_widget.time_spent_line.text()
-        self.comment = self.issue_widget.comment_line.text()
+        draft = self.view.get_issue_draft(self.issue.key)
+        self.time_spent = draft['time_spent'].strip()
+        self.comment = draft['comment']
+        if parse_duration(self.time_spent) is None:
+            QMessageBox.about(self.view, 'Error', INVALID_TIME_SPENT.format(self.time_spent))
+            return False
+        # the work is logged now even if the worklog is sent later
+        self.start_date = datetime.utcnow()
         self.log_work_params = dict()
         return True
 
     def save_handler(self, error):
         super().save_handler(error)
-        self.issue_widget.time_spent_line.clear()
-        self.issue_widget.comment_line.clear()
+        self.view.clear_issue_draft(self.issue.key)
@@ -1,8 +1,8 @@
 from PyQt5.QtWidgets import QMessageBox
-from jira import JIRAError
 
 from config import LOG_TIME
 from controllers.mixins import ProcessWithThreadsMixin
+from controllers.outbox import ADD_COMMENT, UPDATE_ISSUE, TRANSITION_ISSUE
 from controllers.time_log_controller import TimeLogController
 from workflow_window import WorkflowWindow, CompleteWorflowWindow
 
@@ -16,7 +16,8 @@ class WorkflowController(ProcessWithThreadsMixin):
         existing_estimate,
         original_estimate,
         assignee,
-        controller
+        controller,
+        to_status=None
     ):
         super().__init__()
         self.controller = controller
@@ -25,7 +26,9 @@ class WorkflowController(ProcessWithThreadsMixin):
         self.existing_estimate = existing_estimate
         self.original_estimate = original_estimate
         self.status_id = status_id
-        self.assignee = assignee
+        self.to_status = to_status
+        # unassigned issues have no assignee
+        self.assignee = assignee or ''
         self.is_save = False
         self.view = WorkflowWindow(
             self.issue,
@@ -40,49 +43,39 @@ class WorkflowController(ProcessWithThreadsMixin):
         self.view.show()
 
     def save(self):
-        self.start_loading(self.save_workflow, self.save_worflow_handler)
+        self.save_worflow_handler(
+            self.controller.outbox_controller.add(self.issue.key, self.get_changes())
+        )
 
-    def save_workflow(self):
+    def get_changes(self):
         assignee = self.view.assignee_line.text()
         original_estimate = self.view.original_estimate_line.text()
         remaining_estimate = self.view.remaining_estimate_line.text()
         comment = self.view.comment_line.toPlainText()
 
+        changes = []
         if assignee != self.assignee:
-            try:
-                self.issue.update(assignee={'name': assignee})
-            except JIRAError as e:
-                raise ValueError(e.text)
+            changes.append((UPDATE_ISSUE, dict(fields=dict(assignee={'name': assignee}))))
 
         if comment:
-            self.jira_client.client.add_comment(self.issue, comment)
-
-        try:
-            self.issue.update(
-                fields={
-                    'timetracking': {
-                        'remainingEstimate': remaining_estimate,
-                        'originalEstimate': original_estimate,
-                    }
+            changes.append((ADD_COMMENT, dict(comment=comment)))
+
+        changes.append((UPDATE_ISSUE, dict(
+            fields={
+                'timetracking': {
+                    'remainingEstimate': remaining_estimate,
+                    'originalEstimate': original_estimate,
                 }
-            )
-        except JIRAError as e:
-            raise ValueError(e.text)
-        try:
-            self.jira_client.client.transition_issue(
-                    self.issue,
-                    transition=self.status_id
-                )
-        except JIRAError as e:
-            raise ValueError(e.text)
-
-        self.is_save = True
+            }
+        )))
+        changes.append((TRANSITION_ISSUE, dict(transition=self.status_id, status=self.to_status)))
+        return changes
 
     def save_worflow_handler(self, error_text):
         if error_text:
             QMessageBox.about(self.view, 'Error', error_text)
         else:
-            self.controller.refresh_issue_list()
+            self.is_save = True
             self.view.close()
 
     def close(self):
@@ -91,9 +84,10 @@ class WorkflowController(ProcessWithThreadsMixin):
 
 
 class CompleteWorkflowController(TimeLogController):
-    def __init__(self, jira_client, issue, status, assignee, main_controller):
+    def __init__(self, jira_client, issue, status, assignee, main_controller, to_status=None):
         self.status = status
-        self.assignee = assignee
+        self.to_status = to_status
+        self.assignee = assignee or ''
         self.is_save = False
         self.possible_resolutions = jira_client.get_possible_resolutions()
         self.possible_versions = jira_client.get_possible_versions(issue)
@@ -114,46 +108,28 @@ class CompleteWorkflowController(TimeLogController):
 
     def save(self):
         if self.get_timelog_parameters():
-            self.start_loading(self.save_workflow, self.save_handler)
+            self.save_handler(
+                self.main_controller.outbox_controller.add(self.issue.key, self.get_changes())
+            )
 
-    def save_workflow(self):
+    def get_changes(self):
+        changes = []
         assignee = self.view.assignee_line.text()
         if assignee != self.assignee:
-            try:
-                self.issue.update(assignee={'name': assignee})
-            except JIRAError as e:
-                raise ValueError(e.text)
-
-        try:
-            # save timelog
-            self.jira_client.log_work(
-                self.issue,
-                self.time_spent,
-                self.start_date,
-                self.comment,
-                **self.log_work_params)
-        except JIRAError as e:
-            raise ValueError(e.text)
-
-        try:
-            # change resolution
-            resolution = self.view.set_resolution.currentText()
-            self.jira_client.client.transition_issue(
-                self.issue,
-                transition=self.status,
-                resolution={
-                        'name': resolution,
-                }
-            )
-        except JIRAError as e:
-            raise ValueError(e.text)
-
-        try:
-            # save version
-            version = self.view.set_version.currentText()
-            self.issue.update(fields={'fixVersions': [{'name': version}]})
-        except JIRAError as e:
-            raise ValueError(e.text)
+            changes.append((UPDATE_ISSUE, dict(fields=dict(assignee={'name': assignee}))))
+
+        changes.append(self.get_log_work_change())
+        # change resolution
+        resolution = self.view.set_resolution.currentText()
+        changes.append((TRANSITION_ISSUE, dict(
+            transition=self.status,
+            status=self.to_status,
+            fields=dict(resolution={'name': resolution})
+        )))
+        # save version
+        version = self.view.set_version.currentText()
+        changes.append((UPDATE_ISSUE, dict(fields={'fixVersions': [{'name': version}]})))
+        return changes
 
     def save_handler(self, error_text):
         if error_text:
@@ -161,7 +137,6 @@ class CompleteWorkflowController(TimeLogController):
         else:
             self.is_save = True
             self.main_controller.view.timer_log_work.start(LOG_TIME)
-            self.main_controller.refresh_issue_list()
             self.view.close()
 
     def close(self):
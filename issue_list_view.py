@@ -0,0 +1,535 @@
+from functools import partial
+
+from PyQt5.QtCore import (
+    Qt,
+    QTimer,
+    QModelIndex,
+    QPersistentModelIndex,
+    QAbstractListModel
+)
+from PyQt5.QtWidgets import (
+    QApplication,
+    QWidget,
+    QListView,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QGridLayout,
+    QLineEdit,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem
+)
+
+from controllers.reconciliation import INSERT, UPDATE, MOVE, DELETE
+from redefined_QComboBox import MyQComboBox
+
+ISSUE_ROLE = Qt.UserRole
+# editors are kept for rows around the visible ones to scroll smoothly
+EDITORS_MARGIN = 2
+
+
+class ElidedLabel(QLabel):
+    """
+    Shows a text in one line, cut with an ellipsis to the width
+    of the label, and the full text in a tooltip
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.full_text = ''
+
+    def set_full_text(self, text):
+        self.full_text = text
+        self.setToolTip(text)
+        self.elide()
+
+    def elide(self):
+        self.setText(self.fontMetrics().elidedText(
+            self.full_text, Qt.ElideRight, self.width()
+        ))
+
+    def minimumSizeHint(self):
+        # the label can be narrower than its text
+        size = super().minimumSizeHint()
+        size.setWidth(0)
+        return size
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.elide()
+
+
+class QCustomWidget(QWidget):
+    """ Custom list item
+    Displays the issue key, title and a shorthand
+    for the time estimated/spent/remaining
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.estimated_label = QLabel()
+        self.estimated_label.setObjectName('estimated_label')
+        self.spent_label = QLabel()
+        self.spent_label.setObjectName('spent_label')
+        self.remaining_label = QLabel()
+        self.remaining_label.setObjectName('remaining_label')
+
+        self.set_workflow = MyQComboBox(self)
+
+        timetracking_grid = QGridLayout()
+        timetracking_grid.addWidget(self.estimated_label, 0, 0)
+        timetracking_grid.addWidget(self.spent_label, 0, 1)
+        timetracking_grid.addWidget(self.remaining_label, 0, 2)
+        timetracking_grid.addWidget(self.set_workflow, 0, 3, Qt.AlignRight)
+
+        # create labels for issue key and title
+        self.issue_key_label = QLabel()
+        # all the rows have the same height, so the title takes one line
+        self.issue_title_label = ElidedLabel()
+        self.issue_title_label.setObjectName('issue_title_label')
+        self.issue_key_label.setOpenExternalLinks(True)
+
+        self.hbox = QHBoxLayout()
+        self.time_spent_line = QLineEdit()
+        self.time_spent_line.setPlaceholderText('0m')
+        self.time_spent_line.setObjectName('time_spent_line')
+        self.comment_line = QLineEdit()
+        self.comment_line.setPlaceholderText('Add a comment...')
+        self.quick_log_btn = QPushButton('Log')
+        self.quick_log_btn.setObjectName('quick_log_btn')
+        self.log_work_btn = QPushButton('Log work')
+        self.log_work_btn.setObjectName('issue_list_btn')
+        self.open_pomodoro_btn = QPushButton('Pomodoro')
+        self.open_pomodoro_btn.setObjectName('issue_list_btn')
+        self.hbox.addWidget(self.issue_key_label, alignment=Qt.AlignLeft)
+        self.hbox.addWidget(self.time_spent_line, alignment=Qt.AlignLeft)
+        self.hbox.addWidget(self.comment_line)
+        self.hbox.addWidget(self.quick_log_btn, alignment=Qt.AlignRight)
+        self.hbox.addWidget(self.log_work_btn, alignment=Qt.AlignRight)
+        self.hbox.addWidget(self.open_pomodoro_btn, alignment=Qt.AlignRight)
+
+        # create main box layout
+        vbox = QVBoxLayout()
+        vbox.addLayout(self.hbox)
+        vbox.addWidget(self.issue_title_label)
+        vbox.addLayout(timetracking_grid)
+        self.setLayout(vbox)
+
+    def set_issue_key(self, key, link):
+        """
+        Set a link to the web page of the task
+        to issue_key label
+        """
+
+        self.issue_key_label.setText(
+            '<a href={link}>{key}</a>'.format(link=link, key=key)
+        )
+
+    def set_issue_title(self, title):
+        self.issue_title_label.set_full_text(title)
+
+    def set_time(self, estimated, spent, remaining):
+        """
+        Set the estimated/spent/remaining
+        time values to appropriate labels
+        """
+
+        self.estimated_label.setText('Estimated: {}'.format(estimated))
+        self.spent_label.setText('Logged: {}'.format(spent))
+        self.remaining_label.setText('Remaining: {}'.format(remaining))
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Return:
+            self.quick_log_btn.click()
+
+
+class IssueListModel(QAbstractListModel):
+    """
+    Issues of the current filter.
+    Rows are found by issue key with an index which is rebuilt lazily
+    from the first changed row. Runs of deletes and of inserts and moves
+    are applied at once, so a batch of operations costs a few passes
+    over the list instead of one pass for every operation.
+    Time and comments typed in the rows are kept as drafts,
+    so they survive when the editor of a row is closed
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.issues = []
+        self.key_rows = dict()
+        # rows starting from this one may have wrong keys in the index
+        self.reindex_from = None
+        self.drafts = dict()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.issues)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        issue = self.issues[index.row()]
+        if role == Qt.DisplayRole:
+            return issue['key']
+        if role == ISSUE_ROLE:
+            return issue
+        return None
+
+    def invalidate_rows(self, row):
+        if self.reindex_from is None or row < self.reindex_from:
+            self.reindex_from = row
+
+    def find_row(self, key):
+        if self.reindex_from is not None:
+            for row in range(self.reindex_from, len(self.issues)):
+                self.key_rows[self.issues[row]['key']] = row
+            self.reindex_from = None
+        return self.key_rows.get(key)
+
+    def get_issue(self, key):
+        row = self.find_row(key)
+        if row is None:
+            return None
+        return self.issues[row]
+
+    def insert_issue(self, row, issue):
+        row = min(row, len(self.issues))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.issues.insert(row, issue)
+        self.invalidate_rows(row)
+        self.endInsertRows()
+
+    def update_issue(self, issue):
+        row = self.find_row(issue['key'])
+        if row is None:
+            return
+        self.issues[row] = issue
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def move_issue(self, key, new_row):
+        row = self.find_row(key)
+        new_row = min(new_row, len(self.issues) - 1)
+        if row is None or row == new_row:
+            return
+        # destination row is given as it was before the move
+        destination = new_row + 1 if new_row > row else new_row
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), destination)
+        self.issues.insert(new_row, self.issues.pop(row))
+        self.invalidate_rows(min(row, new_row))
+        self.endMoveRows()
+
+    def remove_issue(self, key):
+        row = self.find_row(key)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.issues[row]
+        del self.key_rows[key]
+        self.invalidate_rows(row)
+        self.endRemoveRows()
+        self.drafts.pop(key, None)
+
+    def apply_operations(self, operations):
+        """
+        Apply operations of the reconciliation, consecutive deletes
+        and consecutive inserts and moves are grouped
+        """
+
+        start = 0
+        while start < len(operations):
+            kinds = (DELETE,) if operations[start][0] == DELETE else (INSERT, MOVE)
+            end = start
+            while end < len(operations) and operations[end][0] in kinds:
+                end += 1
+            if operations[start][0] == UPDATE:
+                self.update_issue(operations[start][1])
+                start += 1
+            elif kinds == (DELETE,):
+                self.remove_issues([operation[1] for operation in operations[start:end]])
+                start = end
+            else:
+                self.place_issues(operations[start:end])
+                start = end
+
+    def remove_issues(self, keys):
+        rows = sorted(
+            (row for row in map(self.find_row, keys) if row is not None),
+            reverse=True
+        )
+        # ranges of adjacent rows are removed from the bottom,
+        # so the rows above them keep their numbers
+        index = 0
+        while index < len(rows):
+            last = first = rows[index]
+            index += 1
+            while index < len(rows) and rows[index] == first - 1:
+                first = rows[index]
+                index += 1
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for issue in self.issues[first:last + 1]:
+                del self.key_rows[issue['key']]
+                self.drafts.pop(issue['key'], None)
+            del self.issues[first:last + 1]
+            self.invalidate_rows(first)
+            self.endRemoveRows()
+
+    def place_issues(self, operations):
+        """
+        Apply (INSERT, row, issue) and (MOVE, key, row) to the list of keys
+        first, then add the new rows at the end and reorder all rows at once
+        """
+
+        keys = [issue['key'] for issue in self.issues]
+        new_issues = []
+        for operation in operations:
+            if operation[0] == INSERT:
+                row, issue = operation[1:]
+                keys.insert(min(row, len(keys)), issue['key'])
+                new_issues.append(issue)
+            else:
+                key, row = operation[1:]
+                if self.find_row(key) is None:
+                    continue
+                keys.remove(key)
+                keys.insert(min(row, len(keys)), key)
+
+        if new_issues:
+            self.beginInsertRows(
+                QModelIndex(),
+                len(self.issues),
+                len(self.issues) + len(new_issues) - 1
+            )
+            self.issues.extend(new_issues)
+            self.invalidate_rows(len(self.issues) - len(new_issues))
+            self.endInsertRows()
+
+        issues = {issue['key']: issue for issue in self.issues}
+        self.layoutAboutToBeChanged.emit()
+        old_issues = self.issues
+        self.issues = [issues[key] for key in keys]
+        self.key_rows = {key: row for row, key in enumerate(keys)}
+        self.reindex_from = None
+        # widgets of the rows follow their issues
+        old_indexes = self.persistentIndexList()
+        self.changePersistentIndexList(old_indexes, [
+            self.index(self.key_rows[old_issues[index.row()]['key']])
+            for index in old_indexes
+        ])
+        self.layoutChanged.emit()
+
+    def clear(self):
+        self.beginResetModel()
+        self.issues = []
+        self.key_rows.clear()
+        self.reindex_from = None
+        self.drafts.clear()
+        self.endResetModel()
+
+    def get_draft(self, key):
+        return self.drafts.get(key, dict(time_spent='', comment=''))
+
+    def set_draft(self, key, field, value):
+        self.drafts.setdefault(key, dict(time_spent='', comment=''))[field] = value
+
+    def clear_draft(self, key):
+        self.drafts.pop(key, None)
+        row = self.find_row(key)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+
+class IssueItemDelegate(QStyledItemDelegate):
+    """
+    Paints rows of the issue list and creates
+    widgets for the rows the user can see
+    """
+
+    def __init__(self, controller, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+        self.size_hint = None
+
+    def sizeHint(self, option, index):
+        # all the rows have the same size, so it's computed once
+        if self.size_hint is None:
+            self.size_hint = QCustomWidget().sizeHint()
+        return self.size_hint
+
+    def paint(self, painter, option, index):
+        option = QStyleOptionViewItem(option)
+        self.initStyleOption(option, index)
+        option.text = ''
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, option, painter, option.widget)
+        if option.widget and option.widget.indexWidget(index):
+            return
+        # the row is being scrolled into view and has no widget yet
+        issue = index.data(ISSUE_ROLE)
+        rect = option.rect.adjusted(10, 5, -10, -5)
+        title = option.fontMetrics.elidedText(issue['title'], Qt.ElideRight, rect.width())
+        painter.drawText(
+            rect,
+            Qt.AlignLeft | Qt.AlignTop,
+            '{}\n{}'.format(issue['key'], title)
+        )
+
+    def createEditor(self, parent, option, index):
+        key = index.data()
+        model = index.model()
+        editor = QCustomWidget(parent)
+        editor.quick_log_btn.clicked.connect(
+            partial(self.controller.log_work_from_list, key)
+        )
+        editor.log_work_btn.clicked.connect(
+            partial(self.controller.open_time_log, key)
+        )
+        editor.open_pomodoro_btn.clicked.connect(
+            partial(self.open_pomodoro_window, model, key)
+        )
+        editor.set_workflow.activated[str].connect(
+            partial(self.change_workflow, model, key)
+        )
+        editor.time_spent_line.textEdited.connect(
+            partial(model.set_draft, key, 'time_spent')
+        )
+        editor.comment_line.textEdited.connect(
+            partial(model.set_draft, key, 'comment')
+        )
+        return editor
+
+    def setEditorData(self, editor, index):
+        issue = index.data(ISSUE_ROLE)
+        editor.set_issue_key(issue['key'], issue['link'])
+        editor.set_issue_title(issue['title'])
+        editor.set_time(
+            issue['estimated'],
+            issue['logged'],
+            issue['remaining']
+        )
+
+        # add workflow statuses to dropdown
+        editor.set_workflow.clear()
+        editor.set_workflow.addItems(self.controller.get_possible_workflows(issue))
+        editor.set_workflow.setCurrentIndex(0)
+
+        draft = index.model().get_draft(issue['key'])
+        editor.time_spent_line.setText(draft['time_spent'])
+        editor.comment_line.setText(draft['comment'])
+
+    def setModelData(self, editor, model, index):
+        # drafts are saved to the model as they are typed
+        pass
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
+
+    def open_pomodoro_window(self, model, key):
+        issue = model.get_issue(key)
+        self.controller.open_pomodoro_window(key, issue['title'])
+
+    def change_workflow(self, model, key, new_status):
+        issue = model.get_issue(key)
+        self.controller.change_workflow(
+            issue['workflow'],
+            issue['issue_obj'],
+            new_status
+        )
+
+
+class IssueListView(QListView):
+    """
+    List of issues which keeps widgets only for the visible rows
+    and the row the user is working with
+    """
+
+    def __init__(self, controller):
+        super().__init__()
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.setItemDelegate(IssueItemDelegate(controller, self))
+        self.editor_indexes = []
+        self.editors_timer = QTimer(self)
+        self.editors_timer.setSingleShot(True)
+        self.editors_timer.timeout.connect(self.update_editors)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_editors_update)
+
+    def setModel(self, model):
+        super().setModel(model)
+        model.rowsInserted.connect(self.schedule_editors_update)
+        model.rowsRemoved.connect(self.schedule_editors_update)
+        model.rowsMoved.connect(self.schedule_editors_update)
+        model.layoutChanged.connect(self.schedule_editors_update)
+        model.modelReset.connect(self.schedule_editors_update)
+        model.dataChanged.connect(self.update_editors_data)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_editors_update()
+
+    def schedule_editors_update(self, *args):
+        # many changes in a row cause only one update
+        self.editors_timer.start(0)
+
+    def visible_rows(self):
+        rows_count = self.model().rowCount()
+        viewport_rect = self.viewport().rect()
+        top_index = self.indexAt(viewport_rect.topLeft())
+        if not top_index.isValid():
+            return range(min(rows_count, EDITORS_MARGIN))
+        bottom_index = self.indexAt(viewport_rect.bottomLeft())
+        bottom_row = bottom_index.row() if bottom_index.isValid() else rows_count - 1
+        return range(
+            max(top_index.row() - EDITORS_MARGIN, 0),
+            min(bottom_row + EDITORS_MARGIN, rows_count - 1) + 1
+        )
+
+    def focused_row(self):
+        focus_widget = QApplication.focusWidget()
+        if focus_widget is None:
+            return None
+        for index in self.editor_indexes:
+            editor = self.indexWidget(QModelIndex(index))
+            if editor is not None and editor.isAncestorOf(focus_widget):
+                return index.row()
+        return None
+
+    def update_editors(self):
+        rows = set(self.visible_rows())
+        focused_row = self.focused_row()
+        if focused_row is not None:
+            rows.add(focused_row)
+
+        editor_indexes = []
+        for index in self.editor_indexes:
+            # editors of the removed rows are deleted by the view
+            if not index.isValid():
+                continue
+            if index.row() in rows:
+                rows.discard(index.row())
+                editor_indexes.append(index)
+            else:
+                self.closePersistentEditor(QModelIndex(index))
+        for row in sorted(rows):
+            index = self.model().index(row)
+            self.openPersistentEditor(index)
+            editor_indexes.append(QPersistentModelIndex(index))
+        self.editor_indexes = editor_indexes
+
+    def update_editors_data(self, top_left, bottom_right):
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            index = self.model().index(row)
+            editor = self.indexWidget(index)
+            if editor is not None:
+                self.itemDelegate().setEditorData(editor, index)
+
+    def get_editor(self, key):
+        row = self.model().find_row(key)
+        if row is None:
+            return None
+        return self.indexWidget(self.model().index(row))
@@ -0,0 +1,132 @@
+def parse_transitions(raw_transitions):
+    """
+    Return {transition name: (id, name of the status it leads to)}
+    """
+
+    return {
+        transition['name']: (transition['id'], (transition.get('to') or {}).get('name'))
+        for transition in raw_transitions
+    }
+
+
+# arguments of IssueRecord in the order they are saved
+ROW_FIELDS = (
+    'key',
+    'summary',
+    'status',
+    'assignee',
+    'original_estimate',
+    'remaining_estimate',
+    'time_spent',
+    'transitions',
+    'status_id',
+    'issue_type_id'
+)
+
+
+class IssueRecord:
+    """
+    Compact issue with only the fields shown by the app.
+    The fingerprint of the fields is computed once,
+    so changed issues are found without comparing them
+    """
+
+    __slots__ = ROW_FIELDS + ('fingerprint',)
+
+    def __init__(
+            self,
+            key,
+            summary='',
+            status='',
+            assignee=None,
+            original_estimate=None,
+            remaining_estimate=None,
+            time_spent=None,
+            transitions=None,
+            status_id=None,
+            issue_type_id=None
+    ):
+        self.key = key
+        self.summary = summary
+        self.status = status
+        self.assignee = assignee
+        self.original_estimate = original_estimate
+        self.remaining_estimate = remaining_estimate
+        self.time_spent = time_spent
+        # None until they are taken from the transitions cache
+        self.transitions = transitions
+        # possible transitions depend on the project, the issue type and the status
+        self.status_id = status_id
+        self.issue_type_id = issue_type_id
+        self.fingerprint = hash((
+            summary,
+            status,
+            assignee,
+            original_estimate,
+            remaining_estimate,
+            time_spent,
+            status_id,
+            issue_type_id
+        ))
+
+    @classmethod
+    def from_raw(cls, raw):
+        """
+        Take the shown fields from the issue json of the search
+        """
+
+        fields = raw.get('fields') or {}
+        status = fields.get('status') or {}
+        assignee = fields.get('assignee') or {}
+        timetracking = fields.get('timetracking') or {}
+        issue_type = fields.get('issuetype') or {}
+        raw_transitions = raw.get('transitions')
+        return cls(
+            raw['key'],
+            fields.get('summary', ''),
+            status.get('name', ''),
+            assignee.get('emailAddress'),
+            timetracking.get('originalEstimate'),
+            timetracking.get('remainingEstimate'),
+            timetracking.get('timeSpent'),
+            None if raw_transitions is None else parse_transitions(raw_transitions),
+            status.get('id'),
+            issue_type.get('id')
+        )
+
+    def to_row(self):
+        """
+        Return arguments which create the same record, to save it as json
+        """
+
+        return [getattr(self, name) for name in ROW_FIELDS]
+
+    def replace(self, **fields):
+        """
+        Return a copy of the record with the given fields changed
+        """
+
+        row = dict(zip(ROW_FIELDS, self.to_row()))
+        row.update(fields)
+        return IssueRecord(**row)
+
+    @property
+    def project_key(self):
+        return self.key.split('-')[0]
+
+    def __str__(self):
+        # the jira client puts issues into urls as strings
+        return self.key
+
+    def __repr__(self):
+        return '<IssueRecord {}>'.format(self.key)
+
+
+class IssuePage(list):
+    """
+    Issues of one search request and the number of issues in the filter
+    """
+
+    def __init__(self, issues, total):
+        super().__init__(issues)
+        self.total = total
@@ -1,5 +1,82 @@
+import importlib
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import partial
+
 from jira import JIRA, JIRAError
-from config import MAX_RETRIES, ISSUES_COUNT, SERVER
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, ReadTimeout
+from config import (
+    HTTP_ADAPTER,
+    HTTP_POOL_SIZE,
+    MAX_RETRIES,
+    METADATA_TTL,
+    READ_RETRIES,
+    READ_DEADLINE,
+    RETRY_BACKOFF,
+    RETRY_MAX_BACKOFF,
+    ISSUES_COUNT,
+    ISSUE_LIST_FIELDS,
+    SERVER,
+    TRANSITIONS_FETCH_WORKERS
+)
+from issue_record import IssueRecord, IssuePage, parse_transitions
+from metadata_cache import MetadataCache
+from single_flight import SingleFlight
+from tracing import traced
+
+# errors of an overloaded or rate limited server
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+# property of worklogs and comments which keeps the key of the outbox change
+IDEMPOTENCY_PROPERTY = 'jqr.idempotency.key'
+
+
+def parse_retry_time(value):
+    """
+    Return seconds until the time given by a header as a number of seconds,
+    a unix time, an HTTP date or an ISO 8601 date. Return None if it's unknown
+    """
+
+    now = datetime.now(timezone.utc)
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        # big numbers are unix timestamps
+        return max(seconds - now.timestamp(), 0) if seconds > 10 ** 9 else max(seconds, 0)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            date = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if date is None:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max((date - now).total_seconds(), 0)
+
+
+def get_rate_limit_delay(response):
+    """
+    Return seconds the server asked to wait before the next request or None
+    """
+
+    if response is None:
+        return None
+    for header in ('Retry-After', 'X-RateLimit-Reset'):
+        value = response.headers.get(header)
+        if value:
+            delay = parse_retry_time(value)
+            if delay is not None:
+                return delay
+    return None
 
 
 class JiraClient:
@@ -8,17 +85,219 @@ class JiraClient:
             server=server,
             basic_auth=(email, token),
             max_retries=MAX_RETRIES,
-            timeout=4
+            timeout=4,
+            # the client is created before the main window is shown
+            get_server_info=False
+        )
+        # every controller uses this client, so all requests share its connections
+        self.client._session.mount(server, self.create_transport_adapter())
+        self.metadata = MetadataCache(METADATA_TTL)
+        self.searches = SingleFlight('in-flight searches')
+        # time.monotonic() until which the server asked not to send requests
+        self.throttled_until = 0
+
+    @staticmethod
+    def create_transport_adapter():
+        """
+        Create the adapter set by HTTP_ADAPTER.
+        The default adapter is used if the set one is not installed
+        """
+
+        module_name, class_name = HTTP_ADAPTER.rsplit('.', 1)
+        try:
+            adapter_class = getattr(importlib.import_module(module_name), class_name)
+        except (ImportError, AttributeError):
+            adapter_class = HTTPAdapter
+        if issubclass(adapter_class, HTTPAdapter):
+            return adapter_class(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE)
+        return adapter_class()
+
+    @staticmethod
+    def get_retry_delay(error, attempt):
+        """
+        Return seconds to wait before the next attempt of a read
+        or None if the error must not be retried
+        """
+
+        if attempt >= READ_RETRIES:
+            return None
+        if isinstance(error, JIRAError):
+            if error.status_code not in RETRY_STATUS_CODES:
+                return None
+            delay = get_rate_limit_delay(getattr(error, 'response', None))
+            if delay is not None:
+                # threads waiting for the same limit don't send requests at once
+                return delay + random.uniform(0, RETRY_BACKOFF / 1000)
+        backoff = min(RETRY_BACKOFF * 2 ** attempt, RETRY_MAX_BACKOFF) / 1000
+        return random.uniform(backoff / 2, backoff)
+
+    def retry_read(self, call, *args, **kwargs):
+        """
+        Call a request which doesn't change anything. It is retried
+        on connection errors and rate limits until READ_DEADLINE,
+        so it must not be used for writes
+        """
+
+        deadline = time.monotonic() + READ_DEADLINE / 1000
+        attempt = 0
+        while True:
+            try:
+                return call(*args, **kwargs)
+            except (ConnectionError, ReadTimeout, JIRAError) as ex:
+                self.remember_rate_limit(ex)
+                delay = self.get_retry_delay(ex, attempt)
+                # the error is shown if waiting would take too long
+                if delay is None or time.monotonic() + delay > deadline:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    def remember_rate_limit(self, error):
+        """
+        Keep the time the server asked to wait, so the auto refresh waits too
+        """
+
+        if not isinstance(error, JIRAError) or error.status_code != 429:
+            return
+        delay = get_rate_limit_delay(getattr(error, 'response', None))
+        if delay is None:
+            delay = RETRY_MAX_BACKOFF / 1000
+        self.throttled_until = max(self.throttled_until, time.monotonic() + delay)
+
+    def check_credentials(self):
+        """
+        Raise JIRAError if the email or the token is incorrect
+        """
+
+        # use search because jira.current_user always return none
+        self.validate_query('assignee = currentUser()')
+
+    @traced('jira.get_issues')
+    def get_issues(self, start_at=0, query='', limit=ISSUES_COUNT, fields=ISSUE_LIST_FIELDS):
+        """
+        Return a page of compact issue records with the given fields.
+        The json is not turned into jira resources, only the fields are taken.
+        The same search made by several tasks at a time is sent once
+        """
+
+        fields = ','.join(fields)
+        result = self.searches.call(
+            (query, start_at, limit, fields),
+            self.retry_read,
+            self.client.search_issues,
+            query,
+            fields=fields,
+            startAt=start_at,
+            maxResults=limit,
+            json_result=True
+        )
+        return IssuePage(
+            (IssueRecord.from_raw(raw_issue) for raw_issue in result['issues']),
+            result['total']
+        )
+
+    @traced('jira.get_issue_keys')
+    def get_issue_keys(self, start_at=0, query='', limit=ISSUES_COUNT):
+        """
+        Cheap search that returns only keys of the issues in the filter order
+        """
+
+        result = self.retry_read(
+            self.client.search_issues,
+            query,
+            fields='key',
+            startAt=start_at,
+            maxResults=limit,
+            json_result=True
+        )
+        return [raw_issue['key'] for raw_issue in result['issues']]
+
+    @traced('jira.validate_query')
+    def validate_query(self, query):
+        """
+        Check the query with a search for an empty page of issues.
+        Raise JIRAError if the query is invalid
+        """
+
+        # search_issues treats maxResults=0 as 'fetch all pages'
+        self.retry_read(
+            self.client._get_json,
+            'search',
+            params=dict(jql=query, maxResults=0, validateQuery='strict')
         )
 
-    def get_issues(self, start_at=0, query='', limit=ISSUES_COUNT):
-        return self.client.search_issues(
-                query,
-                fields='key, summary, timetracking, status, assignee',
-                startAt=start_at,
-                maxResults=limit
+    def get_issues_by_keys(self, keys):
+        query = 'key in ({})'.format(', '.join(keys))
+        return self.get_issues(query=query, limit=len(keys))
+
+    @traced('jira.get_transitions')
+    def get_transitions(self, issues):
+        """
+        Return possible transitions {name: (id, status)} for every issue by key
+        and keep them in the issues. Transitions are cached by the project,
+        the issue type and the status, so only one issue of each
+        of these groups is requested
+        """
+
+        # transitions kept in the records could be invalidated since,
+        # so they are always taken from the cache
+        groups = dict()
+        for issue in issues:
+            groups.setdefault(self.get_transitions_key(issue), []).append(issue)
+
+        if groups:
+            with ThreadPoolExecutor(TRANSITIONS_FETCH_WORKERS) as executor:
+                fetched = executor.map(
+                    lambda group: self.metadata.get(
+                        group[0],
+                        partial(self.load_transitions, group[1][0])
+                    ),
+                    groups.items()
+                )
+                for group_issues, transitions in zip(groups.values(), fetched):
+                    for issue in group_issues:
+                        issue.transitions = transitions
+        return {issue.key: issue.transitions for issue in issues}
+
+    @staticmethod
+    def get_transitions_key(issue):
+        if issue.status_id is None or issue.issue_type_id is None:
+            # issues saved by an older version don't have the ids
+            return 'transitions', issue.key
+        return 'transitions', issue.project_key, issue.issue_type_id, issue.status_id
+
+    @traced('jira.load_transitions')
+    def load_transitions(self, issue):
+        return parse_transitions(self.retry_read(self.client.transitions, issue))
+
+    def invalidate_transitions(self, issue_key):
+        """
+        Forget cached transitions of the project, for example
+        when a transition has failed, so they are requested again
+        """
+
+        project_key = issue_key.split('-')[0]
+        self.metadata.invalidate_matching(
+            lambda key: key[0] == 'transitions' and key[1] in (project_key, issue_key)
         )
 
+    @traced('jira.update_issue')
+    def update_issue(self, issue, fields=None, **field_values):
+        """
+        Edit fields of the issue. Unlike Issue.update,
+        the issue is not requested again after the change
+        """
+
+        fields = dict(fields or {}, **field_values)
+        self.client._session.put(
+            self.client._get_url('issue/{}'.format(issue)),
+            data=json.dumps({'fields': fields})
+        )
+
+    def permalink(self, issue):
+        return '{}/browse/{}'.format(self.client._options['server'], issue)
+
+    @traced('jira.log_work')
     def log_work(
             self,
             issue,
@@ -27,58 +306,124 @@ class JiraClient:
             comment,
             adjust_estimate=None,
             new_estimate=None,
-            reduce_by=None
+            reduce_by=None,
+            idempotency_key=None
     ):
-        self.client.add_worklog(
-            issue=issue,
-            timeSpent=time_spent,
+        params = dict(
             adjustEstimate=adjust_estimate,
             newEstimate=new_estimate,
-            reduceBy=reduce_by,
-            started=start_date,
-            comment=comment
+            reduceBy=reduce_by
+        )
+        data = dict(timeSpent=time_spent, started=start_date, comment=comment)
+        self.post_with_idempotency_key(
+            'issue/{}/worklog'.format(issue),
+            data,
+            idempotency_key,
+            params={name: value for name, value in params.items() if value is not None}
+        )
+
+    @traced('jira.add_comment')
+    def add_comment(self, issue, comment, idempotency_key=None):
+        self.post_with_idempotency_key(
+            'issue/{}/comment'.format(issue),
+            dict(body=comment),
+            idempotency_key
+        )
+
+    def post_with_idempotency_key(self, path, data, idempotency_key=None, params=None):
+        """
+        Create a worklog or a comment. The idempotency key is saved
+        as its property, so it can be found if the response was lost
+        """
+
+        if idempotency_key is not None:
+            data['properties'] = [dict(key=IDEMPOTENCY_PROPERTY, value=idempotency_key)]
+        self.client._session.post(
+            self.client._get_url(path),
+            params=params,
+            data=json.dumps(data)
+        )
+
+    @traced('jira.is_posted')
+    def is_posted(self, path, items_name, idempotency_key):
+        """
+        Check if a worklog or a comment with the idempotency key
+        has been created already
+        """
+
+        result = self.retry_read(
+            self.client._get_json,
+            path,
+            params=dict(expand='properties')
+        )
+        return any(
+            item_property['key'] == IDEMPOTENCY_PROPERTY
+            and item_property['value'] == idempotency_key
+            for item in result.get(items_name, [])
+            for item_property in item.get('properties', [])
         )
 
+    def is_work_logged(self, issue, idempotency_key):
+        return self.is_posted('issue/{}/worklog'.format(issue), 'worklogs', idempotency_key)
+
+    def is_comment_added(self, issue, idempotency_key):
+        return self.is_posted('issue/{}/comment'.format(issue), 'comments', idempotency_key)
+
+    @traced('jira.transition_issue')
+    def transition_issue(self, issue, transition, fields=None):
+        self.client.transition_issue(issue, transition, fields=fields)
+
+    @traced('jira.get_status')
+    def get_status(self, issue_key):
+        issue = self.retry_read(self.client.issue, issue_key, fields='status')
+        return issue.fields.status.name
+
+    @staticmethod
+    def format_date(date):
+        # jira expects utc time as "2014-06-03T08:21:01.000+0000"
+        return date.strftime('%Y-%m-%dT%H:%M:%S.000+0000')
+
     def get_possible_resolutions(self):
-        resolutions = self.client.resolutions()
-        possible_resolutions = [resolution.name for resolution in resolutions]
+        return self.metadata.get('resolutions', self.load_possible_resolutions)
 
-        return possible_resolutions
+    @traced('jira.load_possible_resolutions')
+    def load_possible_resolutions(self):
+        resolutions = self.retry_read(self.client.resolutions)
+        return [resolution.name for resolution in resolutions]
 
     def get_possible_versions(self, issue):
-        all_projects = self.client.projects()
-        current_project_key = issue.key.split('-')[0]
+        project_key = issue.key.split('-')[0]
+        return self.metadata.get(
+            ('versions', project_key),
+            partial(self.load_possible_versions, project_key)
+        )
 
-        for id, project in enumerate(all_projects):
-            if project.key == current_project_key:
-                current_project_id = id
+    @traced('jira.load_possible_versions')
+    def load_possible_versions(self, project_key):
+        # versions are requested by the project key, so the projects are not needed
+        versions = self.retry_read(self.client.project_versions, project_key)
+        return [version.name for version in versions]
 
-        versions = self.client.project_versions(
-            all_projects[current_project_id]
-        )
-        possible_versions = [version.name for version in versions]
+    def prefetch_metadata(self, project_keys):
+        """
+        Load metadata used by the workflow windows in the background
+        """
 
-        return possible_versions
+        self.metadata.prefetch('resolutions', self.load_possible_resolutions)
+        for project_key in project_keys:
+            self.metadata.prefetch(
+                ('versions', project_key),
+                partial(self.load_possible_versions, project_key)
+            )
 
     @staticmethod
     def get_remaining_estimate(issue):
-        try:
-            existing_estimate = issue.fields.timetracking.raw[
-                'remainingEstimate'
-            ]
-        except (AttributeError, TypeError, KeyError):
-            existing_estimate = "0m"
-        return existing_estimate
+        return issue.remaining_estimate or '0m'
 
     @staticmethod
     def get_original_estimate(issue):
-        try:
-            original_estimate = issue.fields.timetracking.originalEstimate
-        except JIRAError as e:
-            return e.text
-        except (AttributeError, TypeError):
-            return "You should establish estimate first"
-        return original_estimate
+        return issue.original_estimate or 'You should establish estimate first'
 
+    @traced('jira.issue')
     def issue(self, key):
-        return self.client.issue(key)
+        return self.retry_read(self.client.issue, key)
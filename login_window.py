@@ -12,13 +12,13 @@ from PyQt5.QtWidgets import (
 )
 
 from center_window import CenterWindow
-from config import QSS, LOGO_PATH
+from config import LOGO_PATH
 
 
 class LoginWindow(CenterWindow, QMainWindow):
     def __init__(self, controller):
         super().__init__()
-        self.setStyleSheet(QSS)
+        self.set_style()
         self.controller = controller
         self.resize(380, 200)
         self.setWindowTitle('JIRA Quick Reporter')
@@ -1,17 +1,12 @@
-from functools import partial
-
 from PyQt5.QtCore import Qt, QTimer, QEvent, QUrl, QSize
 from PyQt5.QtGui import QIcon, QDesktopServices
-from PyQt5.QtMultimedia import QSound
 from PyQt5.QtWidgets import (
-    QWidget,
     QListWidget,
     QListWidgetItem,
     QVBoxLayout,
     QHBoxLayout,
     QLabel,
     QPushButton,
-    QGridLayout,
     QLineEdit,
     QSystemTrayIcon,
     QMenu,
@@ -25,7 +20,6 @@ from PyQt5.QtWidgets import (
 
 from center_window import CenterWindow
 from config import (
-    QSS,
     LOGO_PATH,
     LOG_TIME,
     RING_SOUND_PATH,
@@ -34,91 +28,8 @@ from config import (
     MY_ISSUES_ITEM_NAME,
     DELETE_FILTER_ICON
 )
-from redefined_QComboBox import MyQComboBox
-
-
-class QCustomWidget(QWidget):
-    """ Custom list item
-    Displays the issue key, title and a shorthand
-    for the time estimated/spent/remaining
-    """
-
-    def __init__(self):
-        super().__init__()
-        self.estimated_label = QLabel()
-        self.estimated_label.setObjectName('estimated_label')
-        self.spent_label = QLabel()
-        self.spent_label.setObjectName('spent_label')
-        self.remaining_label = QLabel()
-        self.remaining_label.setObjectName('remaining_label')
-
-        self.set_workflow = MyQComboBox(self)
-
-        timetracking_grid = QGridLayout()
-        timetracking_grid.addWidget(self.estimated_label, 0, 0)
-        timetracking_grid.addWidget(self.spent_label, 0, 1)
-        timetracking_grid.addWidget(self.remaining_label, 0, 2)
-        timetracking_grid.addWidget(self.set_workflow, 0, 3, Qt.AlignRight)
-
-        # create labels for issue key and title
-        self.issue_key_label = QLabel()
-        self.issue_title_label = QLabel()
-        self.issue_title_label.setObjectName('issue_title_label')
-        self.issue_title_label.setWordWrap(True)
-        self.issue_key_label.setOpenExternalLinks(True)
-
-        self.hbox = QHBoxLayout()
-        self.time_spent_line = QLineEdit()
-        self.time_spent_line.setPlaceholderText('0m')
-        self.time_spent_line.setObjectName('time_spent_line')
-        self.comment_line = QLineEdit()
-        self.comment_line.setPlaceholderText('Add a comment...')
-        self.quick_log_btn = QPushButton('Log')
-        self.quick_log_btn.setObjectName('quick_log_btn')
-        self.log_work_btn = QPushButton('Log work')
-        self.log_work_btn.setObjectName('issue_list_btn')
-        self.open_pomodoro_btn = QPushButton('Pomodoro')
-        self.open_pomodoro_btn.setObjectName('issue_list_btn')
-        self.hbox.addWidget(self.issue_key_label, alignment=Qt.AlignLeft)
-        self.hbox.addWidget(self.time_spent_line, alignment=Qt.AlignLeft)
-        self.hbox.addWidget(self.comment_line)
-        self.hbox.addWidget(self.quick_log_btn, alignment=Qt.AlignRight)
-        self.hbox.addWidget(self.log_work_btn, alignment=Qt.AlignRight)
-        self.hbox.addWidget(self.open_pomodoro_btn, alignment=Qt.AlignRight)
-
-        # create main box layout
-        vbox = QVBoxLayout()
-        vbox.addLayout(self.hbox)
-        vbox.addWidget(self.issue_title_label)
-        vbox.addLayout(timetracking_grid)
-        self.setLayout(vbox)
-
-    def set_issue_key(self, key, link):
-        """
-        Set a link to the web page of the task
-        to issue_key label
-        """
-
-        self.issue_key_label.setText(
-            '<a href={link}>{key}</a>'.format(link=link, key=key)
-        )
-
-    def set_issue_title(self, title):
-        self.issue_title_label.setText(title)
-
-    def set_time(self, estimated, spent, remaining):
-        """
-        Set the estimated/spent/remaining
-        time values to appropriate labels
-        """
-
-        self.estimated_label.setText('Estimated: {}'.format(estimated))
-        self.spent_label.setText('Logged: {}'.format(spent))
-        self.remaining_label.setText('Remaining: {}'.format(remaining))
-
-    def keyPressEvent(self, event):
-        if event.key() == Qt.Key_Return:
-            self.quick_log_btn.click()
+from issue_list_view import IssueListModel, IssueListView
+from tracing import traced
 
 
 class MainWindow(CenterWindow):
@@ -127,7 +38,7 @@ class MainWindow(CenterWindow):
     """
     def __init__(self, controller):
         super().__init__()
-        self.setStyleSheet(QSS)
+        self.set_style()
         self.controller = controller
         self.resize(1000, 600)
         self.setWindowTitle('JIRA Quick Reporter')
@@ -194,11 +105,13 @@ class MainWindow(CenterWindow):
         self.create_filter_box.addWidget(self.search_issues_button)
 
         self.list_box = QVBoxLayout()
-        self.issue_list_widget = QListWidget()
-        self.issue_list_widget.setObjectName('issue_list')
+        self.issue_list_model = IssueListModel()
+        self.issue_list_view = IssueListView(self.controller)
+        self.issue_list_view.setModel(self.issue_list_model)
+        self.issue_list_view.setObjectName('issue_list')
         self.label_info = QLabel('You have no issues.')
         self.label_info.setAlignment(Qt.AlignCenter)
-        self.list_box.addWidget(self.issue_list_widget)
+        self.list_box.addWidget(self.issue_list_view)
         self.list_box.addWidget(self.label_info)
         self.label_info.hide()
 
@@ -226,6 +139,16 @@ class MainWindow(CenterWindow):
         self.filters_box.addWidget(self.add_filter_button, alignment=Qt.AlignRight)
 
         self.btn_box = QHBoxLayout()
+        self.outbox_btn = QPushButton()
+        self.outbox_btn.setToolTip('Changes which have not been sent to Jira yet')
+        self.outbox_btn.clicked.connect(lambda: self.controller.outbox_controller.show())
+        self.outbox_btn.hide()
+        self.btn_box.addWidget(self.outbox_btn, alignment=Qt.AlignLeft)
+        self.btn_box.addStretch()
+        self.log_all_btn = QPushButton('Log all')
+        self.log_all_btn.setToolTip('Log the time typed in all rows')
+        self.log_all_btn.clicked.connect(self.controller.log_work_from_filled_rows)
+        self.btn_box.addWidget(self.log_all_btn, alignment=Qt.AlignRight)
         self.refresh_btn = QPushButton('Refresh')
         self.refresh_btn.clicked.connect(self.controller.refresh_issue_list)
         self.btn_box.addWidget(self.refresh_btn, alignment=Qt.AlignRight)
@@ -247,9 +170,12 @@ class MainWindow(CenterWindow):
 
         self.tray_menu = QMenu()
         self.action_open = QAction('Open JQR', self)
+        self.action_stats = QAction('Performance stats', self)
         self.action_quit = QAction('Quit JQR', self)
         self.tray_menu.addAction(self.action_open)
         self.action_open.triggered.connect(self.show_jqr_from_tray)
+        self.tray_menu.addAction(self.action_stats)
+        self.action_stats.triggered.connect(self.controller.show_stats)
         self.tray_menu.addAction(self.action_quit)
         self.action_quit.triggered.connect(self.controller.quit_app)
         self.tray_icon.setContextMenu(self.tray_menu)
@@ -266,12 +192,15 @@ class MainWindow(CenterWindow):
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowStaysOnTopHint)
         self.activateWindow()
         self.show()
+        self.controller.refresh_if_due()
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Return:
             self.controller.search_issues_by_query()
 
     def notification_to_log_work(self):
+        # QtMultimedia is slow to load, so it isn't imported until the first ring
+        from PyQt5.QtMultimedia import QSound
         QSound.play(RING_SOUND_PATH)
         self.tray_icon.showMessage(
             '1 hour had passed',
@@ -280,105 +209,40 @@ class MainWindow(CenterWindow):
         )
         self.timer_log_work.start(LOG_TIME)
 
+    def set_outbox_count(self, count, failed_count):
+        if not count:
+            self.outbox_btn.hide()
+            return
+        text = 'Outbox: {}'.format(count)
+        if failed_count:
+            text = '{} ({} failed)'.format(text, failed_count)
+        self.outbox_btn.setText(text)
+        self.outbox_btn.show()
+
+    @traced('view.update_issues')
     def update_issues(self, update_list):
         for issue in update_list:
-            item = self.issue_list_widget.findItems(
-                issue['key'], Qt.MatchExactly
-            )[0]
-            item.setText(issue['key'])
-            issue_widget = self.issue_list_widget.itemWidget(item)
-            issue_widget.set_issue_key(issue['key'], issue['link'])
-            issue_widget.set_issue_title(issue['title'])
-            issue_widget.set_time(
-                issue['estimated'],
-                issue['logged'],
-                issue['remaining']
-            )
-            issue_widget.set_workflow.clear()
-            issue_widget.set_workflow.addItems(self.controller.get_possible_workflows(issue))
-            issue_widget.set_workflow.setCurrentIndex(0)
-
-            issue_widget.set_workflow.activated[str].disconnect()
-            issue_widget.set_workflow.activated[str].connect(
-                partial(
-                    self.controller.change_workflow,
-                    issue['workflow'],
-                    issue['issue_obj'],
-                )
-            )
+            self.issue_list_model.update_issue(issue)
 
-    def delete_issues(self, delete_list):
-        for issue in delete_list:
-            item = self.issue_list_widget.findItems(
-                issue['key'], Qt.MatchExactly
-            )[0]
-            self.issue_list_widget.takeItem(
-                self.issue_list_widget.row(item)
-            )
-
-    def insert_issues(self, new_issues_list):
-        for issue in new_issues_list:
-            issue_widget = QCustomWidget()
-            issue_widget.set_issue_key(issue['key'], issue['link'])
-            issue_widget.set_issue_title(issue['title'])
-            issue_widget.set_time(
-                issue['estimated'],
-                issue['logged'],
-                issue['remaining']
-            )
-
-            issue_widget.quick_log_btn.clicked.connect(
-                partial(
-                    self.controller.log_work_from_list,
-                    issue['key']
-                )
-            )
-
-            issue_widget.log_work_btn.clicked.connect(
-                partial(
-                    self.controller.open_time_log,
-                    issue['key']
-                )
-            )
-
-            issue_widget.open_pomodoro_btn.clicked.connect(
-                partial(
-                    self.controller.open_pomodoro_window,
-                    issue['key'], issue['title']
-                )
-            )
-
-            # add workflow statuses to dropdown
-            possible_workflows = self.controller.get_possible_workflows(issue)
-
-            issue_widget.set_workflow.addItems(possible_workflows)
-            issue_widget.set_workflow.setCurrentIndex(0)
-            issue_widget.set_workflow.activated[str].connect(
-                partial(
-                    self.controller.change_workflow,
-                    issue['workflow'],
-                    issue['issue_obj'],
-                )
-            )
-
-            # add issue item to list
-            issue_list_widget_item = QListWidgetItem()
-            issue_list_widget_item.setText(issue['key'])
-            issue_list_widget_item.setSizeHint(issue_widget.sizeHint())
-            self.issue_list_widget.insertItem(issue['index'], issue_list_widget_item)
-            self.issue_list_widget.setItemWidget(
-                issue_list_widget_item, issue_widget
-            )
+    @traced('view.apply_operations')
+    def apply_operations(self, operations):
+        self.issue_list_model.apply_operations(operations)
         self.set_size_hint()
 
     def set_size_hint(self):
-        self.issue_list_widget.setMinimumWidth(
-            self.issue_list_widget.sizeHintForColumn(0) + 50
+        self.issue_list_view.setMinimumWidth(
+            self.issue_list_view.sizeHintForColumn(0) + 50
         )
-        self.issue_list_widget.setMinimumHeight(
-            self.issue_list_widget.sizeHintForRow(0) * 2
+        self.issue_list_view.setMinimumHeight(
+            self.issue_list_view.sizeHintForRow(0) * 2
         )
 
+    def get_issue_draft(self, issue_key):
+        return self.issue_list_model.get_draft(issue_key)
+
+    def clear_issue_draft(self, issue_key):
+        self.issue_list_model.clear_draft(issue_key)
+
     def show_filters(self, filters_dict):
         for index, key in enumerate(filters_dict):
             if key == SEARCH_ITEM_NAME:
@@ -416,7 +280,7 @@ class MainWindow(CenterWindow):
             set_text = '{}...'.format(self.current_item.text()[:50])
         else:
             set_text = self.current_item.text()
-        self.issue_list_widget.scrollToTop()
+        self.issue_list_view.scrollToTop()
         self.controller.search_issues_by_filter_name(item.text())
         self.filter_name_label.setText(set_text)
         self.filter_edited_label.hide()
@@ -455,12 +319,12 @@ class MainWindow(CenterWindow):
         self.filters_list.setCurrentItem(None)
         self.query_field.setText('')
         self.filter_name_label.setText('Add new filter')
-        self.controller.current_issues.clear()
+        self.controller.clear_issues()
         self.show_no_issues()
 
     def eventFilter(self, obj, event):
         # if user started typing in filter field
-        if obj is self.query_field and event.type() == QEvent.KeyRelease:
+        if event.type() == QEvent.KeyRelease and obj is self.query_field:
             if not self.filters_list.currentItem():
                 return super().eventFilter(obj, event)
             current_filter_name = self.filters_list.currentItem().text().lower()
@@ -509,23 +373,33 @@ class MainWindow(CenterWindow):
                 )[0])
             self.on_filter_selected(self.filters_list.currentItem())
 
+    def remove_filters(self, filter_names):
+        current_item = self.filters_list.currentItem()
+        current_filter_removed = False
+        for filter_name in filter_names:
+            for item in self.filters_list.findItems(filter_name, Qt.MatchExactly):
+                if item is current_item:
+                    current_filter_removed = True
+                self.filters_list.takeItem(self.filters_list.row(item))
+        if current_filter_removed:
+            self.set_current_filter(MY_ISSUES_ITEM_NAME)
+
     def show_no_issues(self, error_text=None):
-        self.issue_list_widget.clear()
-        self.issue_list_widget.hide()
+        self.issue_list_model.clear()
+        self.issue_list_view.hide()
         if error_text:
             self.label_info.setText(error_text)
         self.label_info.show()
 
     def set_workflow_current_state(self, issue_key):
-        item = self.issue_list_widget.findItems(
-            issue_key, Qt.MatchExactly
-        )[0]
-        custom_item = self.issue_list_widget.itemWidget(item)
-        custom_item.set_workflow.setCurrentIndex(0)
+        issue_widget = self.issue_list_view.get_editor(issue_key)
+        # rows without widgets show the current state when they are opened
+        if issue_widget is not None:
+            issue_widget.set_workflow.setCurrentIndex(0)
 
     def wheelEvent(self, event):
         # top left corner coordinates of the issue list
-        list_pos = self.issue_list_widget.pos()
+        list_pos = self.issue_list_view.pos()
         # check if cursor position is on the issue list
         if event.pos().x() >= list_pos.x() and event.pos().y() >= list_pos.y():
             if event.angleDelta().y() < 0:
@@ -0,0 +1,81 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from single_flight import SingleFlight
+from tracing import tracer
+
+
+class MetadataCache:
+    """
+    Cache of jira metadata which rarely changes. A value older than the ttl
+    is returned as is and loaded again in the background
+    """
+
+    def __init__(self, ttl, workers=2):
+        # ttl in ms like the rest of the timers
+        self.ttl = ttl / 1000
+        self.entries = dict()
+        self.loading = set()
+        self.lock = threading.Lock()
+        # threads which need the same missing value wait for one request
+        self.loads = SingleFlight('in-flight metadata')
+        self.executor = ThreadPoolExecutor(workers)
+
+    def get(self, key, load):
+        """
+        Return the cached value. Only a value which has never been loaded
+        is waited for
+        """
+
+        with self.lock:
+            entry = self.entries.get(key)
+        # keys of the same kind of metadata start with its name
+        tracer.count_cache(key[0] if isinstance(key, tuple) else key, entry is not None)
+        if entry is None:
+            return self.loads.call(key, self.load, key, load)
+        value, loaded_at = entry
+        if time.monotonic() - loaded_at > self.ttl:
+            self.prefetch(key, load)
+        return value
+
+    def load(self, key, load):
+        value = load()
+        with self.lock:
+            self.entries[key] = (value, time.monotonic())
+        return value
+
+    def prefetch(self, key, load):
+        """
+        Load the value in the background if it's missing or stale
+        """
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if key in self.loading or (
+                    entry is not None and time.monotonic() - entry[1] <= self.ttl):
+                return
+            self.loading.add(key)
+        self.executor.submit(self.background_load, key, load)
+
+    def background_load(self, key, load):
+        try:
+            self.load(key, load)
+        except Exception:
+            # the stale value is better than nothing, the next get tries again
+            pass
+        finally:
+            with self.lock:
+                self.loading.discard(key)
+
+    def invalidate_matching(self, predicate):
+        with self.lock:
+            for key in [key for key in self.entries if predicate(key)]:
+                del self.entries[key]
+
+    def invalidate(self, key=None):
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
@@ -0,0 +1,101 @@
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import (
+    QPushButton,
+    QHBoxLayout,
+    QVBoxLayout,
+    QLabel,
+    QListWidget,
+    QListWidgetItem
+)
+
+from center_window import CenterWindow
+from controllers.outbox import LOG_WORK, ADD_COMMENT, UPDATE_ISSUE, TRANSITION_ISSUE
+
+
+def describe_change(change):
+    if change.action == LOG_WORK:
+        description = 'Log work {}'.format(change.params['time_spent'])
+    elif change.action == ADD_COMMENT:
+        description = 'Add comment'
+    elif change.action == UPDATE_ISSUE:
+        description = 'Change {}'.format(', '.join(change.params['fields']))
+    elif change.action == TRANSITION_ISSUE:
+        description = 'Change workflow'
+    else:
+        description = change.action
+    text = '{}: {}'.format(change.issue_key, description)
+    if change.error is not None:
+        text = '{}\nError: {}'.format(text, change.error)
+    return text
+
+
+class OutboxWindow(CenterWindow):
+    """
+    Displays changes which have not been sent to jira yet
+    """
+
+    def __init__(self, controller):
+        super().__init__()
+        self.controller = controller
+        self.set_style()
+        self.resize(500, 400)
+        self.center()
+        self.setWindowTitle('Outbox')
+
+        self.main_box = QVBoxLayout()
+        self.info_label = QLabel('All changes are sent.')
+        self.changes_list = QListWidget()
+        self.changes_list.setWordWrap(True)
+        self.changes_list.itemSelectionChanged.connect(self.update_buttons)
+
+        self.btn_box = QHBoxLayout()
+        self.send_btn = QPushButton('Send now')
+        self.send_btn.clicked.connect(self.controller.flush)
+        self.retry_btn = QPushButton('Retry failed')
+        self.retry_btn.clicked.connect(self.controller.retry)
+        self.discard_btn = QPushButton('Discard')
+        self.discard_btn.setToolTip('Remove the selected change, it will not be sent')
+        self.discard_btn.clicked.connect(self.discard_btn_click)
+        self.btn_box.addWidget(self.send_btn)
+        self.btn_box.addWidget(self.retry_btn)
+        self.btn_box.addStretch()
+        self.btn_box.addWidget(self.discard_btn)
+
+        self.main_box.addWidget(self.info_label)
+        self.main_box.addWidget(self.changes_list)
+        self.main_box.addLayout(self.btn_box)
+        self.setLayout(self.main_box)
+
+        # changes are sent again when the connection is back
+        self.timer_flush = QTimer()
+        self.timer_flush.setSingleShot(True)
+        self.timer_flush.timeout.connect(self.controller.flush)
+
+    def show_changes(self, changes):
+        self.changes_list.clear()
+        failed_count = 0
+        for change in changes:
+            item = QListWidgetItem(describe_change(change))
+            item.setData(Qt.UserRole, change.id)
+            if change.error is not None:
+                failed_count += 1
+                item.setForeground(Qt.red)
+            self.changes_list.addItem(item)
+        if not changes:
+            self.info_label.setText('All changes are sent.')
+        elif failed_count:
+            self.info_label.setText(
+                '{} changes are waiting, {} failed.'.format(len(changes), failed_count)
+            )
+        else:
+            self.info_label.setText('{} changes are waiting to be sent.'.format(len(changes)))
+        self.retry_btn.setEnabled(bool(failed_count))
+        self.send_btn.setEnabled(bool(changes))
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.discard_btn.setEnabled(bool(self.changes_list.selectedItems()))
+
+    def discard_btn_click(self):
+        for change_id in [item.data(Qt.UserRole) for item in self.changes_list.selectedItems()]:
+            self.controller.discard(change_id)
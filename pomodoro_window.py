@@ -18,9 +18,8 @@ from PyQt5.QtWidgets import (
     QSlider
 )
 
-from center_window import CenterWindow
+from center_window import CenterWindow, load_qss
 from config import (
-    QSS,
     RING_SOUND_PATH,
     POMODORO_MARK_PATH,
     LOGGED_TIME_DIR
@@ -72,7 +71,7 @@ class BreakDialog(QDialog):
 class Settings(QWidget):
     def __init__(self, pomodoro_window):
         super().__init__()
-        self.setStyleSheet(QSS)
+        self.setStyleSheet(load_qss())
         self.setWindowTitle('Settings')
         self.pomodoro_window = pomodoro_window
         self.main_box = QFormLayout()
@@ -134,7 +133,7 @@ class PomodoroWindow(CenterWindow):
     def __init__(self, controller, issue_key, issue_title, tray_icon):
         super().__init__()
         self.center()
-        self.setStyleSheet(QSS)
+        self.set_style()
         self.controller = controller
         self.tray_icon = tray_icon
         if not os.path.exists(LOGGED_TIME_DIR):
@@ -0,0 +1,39 @@
+import threading
+from concurrent.futures import Future
+
+from tracing import tracer
+
+
+class SingleFlight:
+    """
+    Calls with the same key which are made while the first one is running
+    wait for it and share its result, so identical requests are sent once
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = dict()
+        self.lock = threading.Lock()
+
+    def call(self, key, function, *args, **kwargs):
+        with self.lock:
+            future = self.calls.get(key)
+            is_first = future is None
+            if is_first:
+                future = self.calls[key] = Future()
+        tracer.count_cache(self.name, not is_first)
+        if not is_first:
+            return future.result()
+
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as ex:
+            future.set_exception(ex)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            # the next call with this key is sent again
+            with self.lock:
+                del self.calls[key]
@@ -0,0 +1,87 @@
+from PyQt5.QtWidgets import (
+    QPushButton,
+    QHBoxLayout,
+    QVBoxLayout,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView
+)
+
+from center_window import CenterWindow
+from config import TRACE_PATH
+from tracing import tracer
+
+SPAN_COLUMNS = ('Span', 'Count', 'Errors', 'p50, ms', 'p95, ms', 'Max, ms')
+CACHE_COLUMNS = ('Cache', 'Hits', 'Misses', 'Hit rate')
+
+
+def create_table(columns):
+    table = QTableWidget(0, len(columns))
+    table.setHorizontalHeaderLabels(columns)
+    table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+    table.verticalHeader().hide()
+    table.setEditTriggers(QTableWidget.NoEditTriggers)
+    return table
+
+
+def fill_table(table, rows):
+    table.setRowCount(len(rows))
+    for row, values in enumerate(rows):
+        for column, value in enumerate(values):
+            table.setItem(row, column, QTableWidgetItem(value))
+
+
+class StatsWindow(CenterWindow):
+    """
+    Displays latencies of the jira requests, tasks and view updates
+    and hit rates of the caches since the app was started
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.set_style()
+        self.resize(800, 600)
+        self.center()
+        self.setWindowTitle('Performance stats')
+
+        self.main_box = QVBoxLayout()
+        self.spans_table = create_table(SPAN_COLUMNS)
+        self.caches_table = create_table(CACHE_COLUMNS)
+        self.caches_table.setMaximumHeight(200)
+        self.info_label = QLabel()
+        self.info_label.setWordWrap(True)
+
+        self.btn_box = QHBoxLayout()
+        self.refresh_btn = QPushButton('Refresh')
+        self.refresh_btn.clicked.connect(self.show_stats)
+        self.export_btn = QPushButton('Export')
+        self.export_btn.setToolTip('Append the recorded spans to {}'.format(TRACE_PATH))
+        self.export_btn.clicked.connect(self.export_btn_click)
+        self.btn_box.addWidget(self.refresh_btn)
+        self.btn_box.addStretch()
+        self.btn_box.addWidget(self.export_btn)
+
+        self.main_box.addWidget(self.spans_table)
+        self.main_box.addWidget(self.caches_table)
+        self.main_box.addWidget(self.info_label)
+        self.main_box.addLayout(self.btn_box)
+        self.setLayout(self.main_box)
+
+    def show_stats(self):
+        fill_table(self.spans_table, [
+            (name, str(count), str(errors), '{:.1f}'.format(p50), '{:.1f}'.format(p95), '{:.1f}'.format(longest))
+            for name, count, errors, p50, p95, longest in tracer.get_span_stats()
+        ])
+        fill_table(self.caches_table, [
+            (name, str(hits), str(misses), '{:.0%}'.format(hit_rate))
+            for name, hits, misses, hit_rate in tracer.get_cache_stats()
+        ])
+
+    def export_btn_click(self):
+        try:
+            count = tracer.export()
+        except OSError as ex:
+            self.info_label.setText('Spans were not exported: {}'.format(ex))
+            return
+        self.info_label.setText('{} spans were added to {}'.format(count, TRACE_PATH))
@@ -0,0 +1,57 @@
+import threading
+import time
+from types import SimpleNamespace as sn
+
+import pytest
+
+from async_jiraclient import AsyncJiraClient
+from controllers.mixins import current_task, run_coroutine, TaskCancelled
+from issue_record import IssueRecord, IssuePage
+
+
+def get_issues(start_at, query, limit):
+    # later pages come first, they are yielded in order anyway
+    time.sleep(0.05 if start_at < 20 else 0)
+    return IssuePage(
+        [IssueRecord('JQR-{}'.format(index)) for index in range(start_at, min(start_at + limit, 25))],
+        25
+    )
+
+
+async def get_keys(client, limit):
+    return [
+        issue.key
+        async for page in client.iter_issue_pages('project = JQR', limit)
+        for issue in page
+    ]
+
+
+def test_iter_issue_pages(monkeypatch):
+    monkeypatch.setattr('async_jiraclient.ISSUES_PAGE_SIZE', 10)
+    client = AsyncJiraClient(sn(get_issues=get_issues))
+    assert run_coroutine(get_keys(client, 30)) == ['JQR-{}'.format(index) for index in range(25)]
+    assert run_coroutine(get_keys(client, 5)) == ['JQR-{}'.format(index) for index in range(5)]
+
+
+def test_run_coroutine_cancelled():
+    requested = threading.Event()
+
+    def issue(key):
+        requested.set()
+        time.sleep(0.5)
+
+    def cancel():
+        requested.wait()
+        task.cancelled = True
+
+    task = sn(cancelled=False)
+    current_task.task = task
+    threading.Thread(target=cancel).start()
+    client = AsyncJiraClient(sn(issue=issue))
+    started = time.monotonic()
+    try:
+        with pytest.raises(TaskCancelled):
+            run_coroutine(client.issue('JQR-1'))
+    finally:
+        current_task.task = None
+    assert time.monotonic() - started < 0.3
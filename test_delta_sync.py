@@ -0,0 +1,25 @@
+import time
+
+from controllers.delta_sync import DeltaSync
+
+
+def test_split_query():
+    assert DeltaSync.split_query('project = JQR order by created desc') == (
+        'project = JQR',
+        'order by created desc'
+    )
+    assert DeltaSync.split_query('ORDER BY created') == ('', 'ORDER BY created')
+    assert DeltaSync.split_query('project = JQR') == ('project = JQR', '')
+
+
+def test_delta_query():
+    delta_sync = DeltaSync()
+    query = 'assignee = currentuser() order by created desc'
+    assert delta_sync.begin(query) is None
+    delta_sync.commit(query)
+    delta_sync.last_sync[query] = time.monotonic() - 90
+    assert delta_sync.begin(query) == (
+        '(assignee = currentuser()) and updated >= -3m order by created desc'
+    )
+    delta_sync.reset(query)
+    assert delta_sync.begin(query) is None
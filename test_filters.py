@@ -0,0 +1,33 @@
+from types import SimpleNamespace as sn
+
+from jira import JIRAError
+from requests.exceptions import ConnectionError
+
+from controllers.filters import IssueFiltersHandler
+
+
+def test_validate_filters():
+    errors = {
+        'invalid': JIRAError(status_code=400, text='The value does not exist'),
+        'throttled': JIRAError(status_code=429),
+        'unauthorized': JIRAError(status_code=401),
+        'offline': ConnectionError(),
+    }
+
+    def validate_query(filter_query):
+        if filter_query in errors:
+            raise errors[filter_query]
+
+    filters_handler = IssueFiltersHandler(sn(validate_query=validate_query))
+    filters_handler.items.update(
+        {name: name for name in ['valid', 'invalid', 'throttled', 'unauthorized', 'offline']}
+    )
+    filters_handler.validate_filters()
+
+    assert filters_handler.invalid_filters == ['invalid']
+    assert filters_handler.is_validated('valid')
+    assert filters_handler.is_validated('invalid')
+    # these filters are checked again later
+    assert not filters_handler.is_validated('throttled')
+    assert not filters_handler.is_validated('unauthorized')
+    assert not filters_handler.is_validated('offline')
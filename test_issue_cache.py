@@ -0,0 +1,41 @@
+import os
+import sqlite3
+import tempfile
+
+from controllers.issue_cache import IssueCache
+from issue_record import IssueRecord
+
+
+def test_issue_cache():
+    issue_cache = IssueCache(os.path.join(tempfile.mkdtemp(), 'issues_cache.sqlite3'))
+    assert issue_cache.load('project = JQR') is None
+
+    issues = [
+        IssueRecord('JQR-1', 'title', 'To Do', transitions={'Declare done': ('171', 'Done')}),
+        IssueRecord('JQR-2', 'other title', time_spent='1h'),
+    ]
+    issue_cache.save('project = JQR', issues)
+    loaded_issues = issue_cache.load('project = JQR')
+    assert [issue.to_row() for issue in loaded_issues] == [
+        ['JQR-1', 'title', 'To Do', None, None, None, None, {'Declare done': ['171', 'Done']}, None, None],
+        ['JQR-2', 'other title', '', None, None, None, '1h', None, None, None],
+    ]
+    assert [issue.fingerprint for issue in loaded_issues] == [issue.fingerprint for issue in issues]
+    assert issue_cache.load('assignee = currentuser()') is None
+
+
+def test_issue_cache_corrupt_row():
+    path = os.path.join(tempfile.mkdtemp(), 'issues_cache.sqlite3')
+    issue_cache = IssueCache(path)
+    issue_cache.save('project = JQR', [IssueRecord('JQR-1')])
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute("UPDATE issue_records_v2 SET issues = '[[\"JQR-1\", '")
+    connection.close()
+    # a broken cache is a cache miss
+    assert issue_cache.load('project = JQR') is None
+
+    with open(path, 'wb') as file:
+        file.write(b'not a database')
+    assert issue_cache.load('project = JQR') is None
+    issue_cache.save('project = JQR', [IssueRecord('JQR-1')])
@@ -0,0 +1,73 @@
+from PyQt5.QtCore import QPersistentModelIndex
+from PyQt5.QtWidgets import QApplication
+
+from controllers.reconciliation import INSERT, UPDATE, MOVE, DELETE
+from issue_list_view import IssueListModel, QCustomWidget
+
+app = QApplication.instance() or QApplication([])
+
+
+def get_model(*keys):
+    model = IssueListModel()
+    for row, key in enumerate(keys):
+        model.insert_issue(row, dict(key=key))
+    return model
+
+
+def test_find_row_after_insert_and_remove():
+    model = get_model('JQR-1', 'JQR-2', 'JQR-3')
+    model.insert_issue(0, dict(key='JQR-4'))
+    model.remove_issue('JQR-2')
+
+    assert [model.find_row(key) for key in ('JQR-4', 'JQR-1', 'JQR-3')] == [0, 1, 2]
+    assert model.find_row('JQR-2') is None
+
+
+def test_find_row_after_move():
+    model = get_model('JQR-1', 'JQR-2', 'JQR-3')
+    model.move_issue('JQR-1', 2)
+    assert [issue['key'] for issue in model.issues] == ['JQR-2', 'JQR-3', 'JQR-1']
+    assert model.find_row('JQR-1') == 2
+
+    model.move_issue('JQR-1', 0)
+    assert [model.find_row(key) for key in ('JQR-1', 'JQR-2', 'JQR-3')] == [0, 1, 2]
+
+
+def test_apply_operations():
+    model = get_model('JQR-1', 'JQR-2', 'JQR-3', 'JQR-4', 'JQR-5')
+    model.set_draft('JQR-2', 'time_spent', '1h')
+    model.set_draft('JQR-5', 'time_spent', '2h')
+    # editors of the rows are kept by persistent indexes
+    editor_index = QPersistentModelIndex(model.index(4))
+    model.apply_operations([
+        (DELETE, 'JQR-1'),
+        (DELETE, 'JQR-2'),
+        (DELETE, 'JQR-4'),
+        (INSERT, 0, dict(key='JQR-6')),
+        (MOVE, 'JQR-5', 0),
+        (INSERT, 3, dict(key='JQR-7')),
+        (UPDATE, dict(key='JQR-3', title='new title')),
+    ])
+
+    assert [issue['key'] for issue in model.issues] == ['JQR-5', 'JQR-6', 'JQR-3', 'JQR-7']
+    assert [model.find_row(key) for key in ('JQR-5', 'JQR-6', 'JQR-3', 'JQR-7')] == [0, 1, 2, 3]
+    assert model.find_row('JQR-1') is None
+    assert model.get_issue('JQR-3')['title'] == 'new title'
+    assert model.get_draft('JQR-2')['time_spent'] == ''
+    assert model.get_draft('JQR-5')['time_spent'] == '2h'
+    assert editor_index.row() == 0
+
+
+def test_long_title_is_elided():
+    title = 'Update the estimates of the issues ' * 10
+    widget = QCustomWidget()
+    widget.set_issue_title(title)
+    size = widget.sizeHint()
+    widget.show()
+    widget.resize(400, size.height())
+    app.processEvents()
+    # the row keeps the height of the other rows and the title is in the tooltip
+    assert widget.sizeHint().height() == size.height()
+    assert widget.issue_title_label.text() != title
+    assert widget.issue_title_label.text().endswith('\u2026')
+    assert widget.issue_title_label.toolTip() == title
@@ -0,0 +1,32 @@
+from issue_record import IssueRecord
+
+
+def get_raw_issue(**fields):
+    return {
+        'key': 'JQR-1',
+        'fields': dict({
+            'summary': 'title',
+            'status': {'name': 'Backlog', 'id': '1'},
+            'assignee': {'emailAddress': 'user@example.com', 'displayName': 'User'},
+            'timetracking': {'originalEstimate': '1h', 'timeSpent': '30m'},
+        }, **fields),
+        'transitions': [{'name': 'Declare done', 'id': '171', 'to': {'name': 'Done'}}],
+    }
+
+
+def test_from_raw():
+    issue = IssueRecord.from_raw(get_raw_issue())
+    assert issue.key == 'JQR-1'
+    assert issue.status == 'Backlog'
+    assert issue.assignee == 'user@example.com'
+    assert issue.time_spent == '30m'
+    assert issue.remaining_estimate is None
+    assert issue.transitions == {'Declare done': ('171', 'Done')}
+    assert IssueRecord(*issue.to_row()).fingerprint == issue.fingerprint
+
+
+def test_fingerprint():
+    issue = IssueRecord.from_raw(get_raw_issue())
+    assert IssueRecord.from_raw(get_raw_issue()).fingerprint == issue.fingerprint
+    assert IssueRecord.from_raw(get_raw_issue(summary='new title')).fingerprint != issue.fingerprint
+    assert IssueRecord.from_raw(get_raw_issue(assignee=None)).fingerprint != issue.fingerprint
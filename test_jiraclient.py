@@ -0,0 +1,98 @@
+from jiraclient import JiraClient, parse_retry_time
+from issue_record import IssueRecord
+from metadata_cache import MetadataCache
+import time
+import unittest
+from types import SimpleNamespace as sn
+from unittest import mock
+
+from jira import JIRAError
+
+
+class Test(unittest.TestCase):
+    def test_get_transitions(self):
+        fetched = []
+
+        def transitions(issue):
+            fetched.append(issue.key)
+            return [{'name': 'Flag', 'id': '181', 'to': {'name': 'Flagged'}}]
+
+        jira_client = JiraClient.__new__(JiraClient)
+        jira_client.client = sn(transitions=transitions)
+        jira_client.metadata = MetadataCache(60000)
+        issues = [
+            IssueRecord('JQR-1', status_id='1', issue_type_id='10001'),
+            IssueRecord('JQR-2', status_id='1', issue_type_id='10001'),
+        ]
+        self.assertEqual(jira_client.get_transitions(issues), {
+            'JQR-1': {'Flag': ('181', 'Flagged')},
+            'JQR-2': {'Flag': ('181', 'Flagged')},
+        })
+        self.assertEqual(fetched, ['JQR-1'])
+        jira_client.get_transitions(issues)
+        self.assertEqual(fetched, ['JQR-1'])
+
+        # the records shown with the old transitions get the new ones
+        jira_client.invalidate_transitions('JQR-2')
+        saved_issue = IssueRecord('JQR-3', transitions={'Declare done': ('171', 'Done')})
+        self.assertEqual(jira_client.get_transitions(issues + [saved_issue]), {
+            'JQR-1': {'Flag': ('181', 'Flagged')},
+            'JQR-2': {'Flag': ('181', 'Flagged')},
+            'JQR-3': {'Flag': ('181', 'Flagged')},
+        })
+        self.assertEqual(fetched, ['JQR-1', 'JQR-1', 'JQR-3'])
+
+    @staticmethod
+    def create_client():
+        jira_client = JiraClient.__new__(JiraClient)
+        jira_client.throttled_until = 0
+        return jira_client
+
+    def test_retry_read(self):
+        errors = [
+            JIRAError(status_code=429, response=sn(headers={'Retry-After': '2'})),
+            JIRAError(status_code=503, response=sn(headers={})),
+        ]
+
+        def search():
+            if errors:
+                raise errors.pop(0)
+            return 'issues'
+
+        jira_client = self.create_client()
+        with mock.patch('jiraclient.time.sleep') as sleep:
+            self.assertEqual(jira_client.retry_read(search), 'issues')
+        delays = [call[0][0] for call in sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertGreaterEqual(delays[0], 2)
+
+    def test_retry_read_client_error(self):
+        def search():
+            raise JIRAError(status_code=400)
+
+        with mock.patch('jiraclient.time.sleep') as sleep:
+            with self.assertRaises(JIRAError):
+                self.create_client().retry_read(search)
+        sleep.assert_not_called()
+
+    def test_retry_read_deadline(self):
+        def search():
+            raise JIRAError(status_code=429, response=sn(headers={'Retry-After': '3600'}))
+
+        jira_client = self.create_client()
+        with mock.patch('jiraclient.time.sleep') as sleep:
+            with self.assertRaises(JIRAError):
+                jira_client.retry_read(search)
+        sleep.assert_not_called()
+        # the auto refresh waits for the rate limit too
+        self.assertGreater(jira_client.throttled_until, time.monotonic() + 3000)
+
+    def test_parse_retry_time(self):
+        self.assertEqual(parse_retry_time('30'), 30)
+        self.assertEqual(parse_retry_time('2000-01-01T00:00:00Z'), 0)
+        self.assertEqual(parse_retry_time('Sat, 01 Jan 2000 00:00:00 GMT'), 0)
+        self.assertIsNone(parse_retry_time('soon'))
+
+
+if __name__ == '__main__':
+    unittest.main()
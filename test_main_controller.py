@@ -0,0 +1,89 @@
+from types import SimpleNamespace as sn
+
+from PyQt5.QtWidgets import QApplication, QMessageBox
+
+from controllers.main_controller import MainController
+from controllers.reconciliation import INSERT, UPDATE
+from issue_record import IssueRecord
+from jiraclient import JiraClient
+
+# the controller creates its windows
+app = QApplication.instance() or QApplication([])
+
+
+def create_controller(issues):
+    controller = MainController(None)
+    controller.jira_client = sn(
+        throttled_until=0,
+        permalink=lambda issue: 'https://jira/browse/{}'.format(issue.key),
+        prefetch_metadata=lambda project_keys: None,
+        format_date=JiraClient.format_date
+    )
+    controller.view.tray_icon.showMessage = lambda *args, **kwargs: None
+    controller.set_current_issues(issues)
+    controller.issue_operations.extend(controller.get_view_operations(
+        [(INSERT, row, issue) for row, issue in enumerate(issues)],
+        {issue.key: {} for issue in issues}
+    ))
+    controller.show_issue_operations()
+    return controller
+
+
+def test_failed_refresh_keeps_shown_issues():
+    controller = create_controller([IssueRecord('JQR-1'), IssueRecord('JQR-2')])
+    controller.view.issue_list_model.set_draft('JQR-1', 'time_spent', '1h')
+
+    controller.refresh_issue_list_widget('Connection error', keep_issues=True)
+    assert controller.issue_keys == ['JQR-1', 'JQR-2']
+    assert controller.view.issue_list_model.rowCount() == 2
+    assert controller.view.get_issue_draft('JQR-1')['time_spent'] == '1h'
+    controller.view.timer_refresh.stop()
+
+
+def test_rejected_credentials_stop_refreshes():
+    controller = create_controller([IssueRecord('JQR-1')])
+    checks = []
+    controller.check_credentials = lambda: checks.append(True)
+    # the outbox waits for the check of the credentials
+    controller.outbox_controller.flush()
+    assert checks == [True]
+    assert not controller.scheduler.has_tasks('outbox')
+
+    controller.credentials_rejected = True
+    controller.refresh_issue_list_widget('Unauthorized')
+    assert not controller.view.timer_refresh.isActive()
+    assert controller.issue_keys == ['JQR-1']
+
+
+def test_log_work_from_filled_rows_rejects_invalid_time(monkeypatch):
+    controller = create_controller([IssueRecord('JQR-1'), IssueRecord('JQR-2')])
+    messages = []
+    monkeypatch.setattr(QMessageBox, 'about', lambda parent, title, text: messages.append(text))
+    added = []
+    controller.outbox_controller.add_all = lambda issue_changes: added.append(issue_changes)
+    controller.view.issue_list_model.set_draft('JQR-1', 'time_spent', '1h')
+    controller.view.issue_list_model.set_draft('JQR-2', 'time_spent', 'an hour')
+
+    controller.log_work_from_filled_rows()
+    assert added == []
+    assert len(messages) == 1 and 'JQR-2' in messages[0]
+    assert controller.view.get_issue_draft('JQR-1')['time_spent'] == '1h'
+
+
+def test_update_issues_changed_and_stale():
+    controller = create_controller([IssueRecord('JQR-1'), IssueRecord('JQR-2'), IssueRecord('JQR-3')])
+    fetched_issues = [IssueRecord('JQR-1', 'new title'), IssueRecord('JQR-2'), IssueRecord('JQR-3')]
+    controller.jira_client.get_issues_by_keys = lambda keys: [
+        issue for issue in fetched_issues if issue.key in keys
+    ]
+    controller.jira_client.get_transitions = lambda issues: {issue.key: {} for issue in issues}
+    # the sent change of this issue is still shown by its row
+    controller.stale_keys.add('JQR-3')
+
+    controller.update_issues(['JQR-1', 'JQR-2', 'JQR-3'])
+    assert [
+        (operation[0], operation[1]['key']) for operation in controller.issue_operations
+    ] == [(UPDATE, 'JQR-1'), (UPDATE, 'JQR-3')]
+    assert controller.current_issues['JQR-1'] is fetched_issues[0]
+    assert controller.stale_keys == set()
+    assert controller.issues_changed
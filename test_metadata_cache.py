@@ -0,0 +1,24 @@
+import time
+
+from metadata_cache import MetadataCache
+
+
+def test_metadata_cache():
+    cache = MetadataCache(ttl=0)
+    values = iter(['old', 'new'])
+    assert cache.get('resolutions', lambda: next(values)) == 'old'
+    # the stale value is returned while the new one is loading
+    assert cache.get('resolutions', lambda: next(values)) == 'old'
+    cache.executor.shutdown(wait=True)
+    assert cache.entries['resolutions'][0] == 'new'
+
+
+def test_metadata_cache_fresh():
+    cache = MetadataCache(ttl=60000)
+    calls = []
+    for _ in range(3):
+        cache.get('versions', lambda: calls.append(time.monotonic()) or ['1.0'])
+    assert len(calls) == 1
+    cache.invalidate('versions')
+    cache.get('versions', lambda: calls.append(time.monotonic()) or ['1.0'])
+    assert len(calls) == 2
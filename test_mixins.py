@@ -0,0 +1,199 @@
+import threading
+import time
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from tracing import tracer
+from controllers.mixins import (
+    TaskScheduler,
+    LoadingIndicator,
+    raise_if_cancelled,
+    PRIORITY_BACKGROUND,
+    PRIORITY_USER,
+    ISSUE_LIST,
+    OUTBOX
+)
+
+# signals of the tasks are delivered by the event loop
+app = QApplication.instance() or QApplication([])
+
+
+def wait_for_tasks(scheduler, timeout=5):
+    deadline = time.monotonic() + timeout
+    while scheduler.tasks:
+        assert time.monotonic() < deadline, 'tasks are not finished'
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+
+
+def submit(scheduler, callback, results, name, **kwargs):
+    return scheduler.submit(
+        callback,
+        lambda error_text: results.append((name, 'finished', error_text)),
+        lambda: results.append((name, 'cancelled')),
+        **kwargs
+    )
+
+
+def create_blocked_scheduler():
+    """
+    Return a scheduler with one thread which is busy until the event is set
+    """
+
+    scheduler = TaskScheduler()
+    scheduler.pool.setMaxThreadCount(1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    submit(scheduler, block, [], 'block')
+    started.wait(5)
+    return scheduler, release
+
+
+def test_priority():
+    scheduler, release = create_blocked_scheduler()
+    order = []
+    submit(scheduler, lambda: order.append('background'), [], 'background', priority=PRIORITY_BACKGROUND)
+    submit(scheduler, lambda: order.append('user'), [], 'user', priority=PRIORITY_USER)
+    release.set()
+    wait_for_tasks(scheduler)
+    assert order == ['user', 'background']
+
+
+def test_queued_task_superseded():
+    scheduler, release = create_blocked_scheduler()
+    results = []
+    submit(scheduler, lambda: results.append('first ran'), results, 'first', group=ISSUE_LIST)
+    submit(scheduler, lambda: None, results, 'second', group=ISSUE_LIST)
+    # the first task is taken from the queue at once
+    app.processEvents()
+    assert results == [('first', 'cancelled')]
+    assert scheduler.has_tasks(ISSUE_LIST)
+    release.set()
+    wait_for_tasks(scheduler)
+    assert results == [('first', 'cancelled'), ('second', 'finished', None)]
+    assert not scheduler.has_tasks(ISSUE_LIST)
+
+
+def test_running_task_superseded():
+    scheduler = TaskScheduler()
+    results = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def refresh():
+        started.set()
+        release.wait(5)
+        raise_if_cancelled()
+        results.append('changed')
+
+    submit(scheduler, refresh, results, 'first', group=ISSUE_LIST)
+    started.wait(5)
+    # a user action supersedes a background task, but not the other way round
+    submit(scheduler, lambda: None, results, 'background', group=ISSUE_LIST, priority=PRIORITY_BACKGROUND)
+    submit(scheduler, lambda: None, results, 'second', group=ISSUE_LIST)
+    release.set()
+    wait_for_tasks(scheduler)
+    assert 'changed' not in results
+    assert sorted(results) == [
+        ('background', 'cancelled'),
+        ('first', 'cancelled'),
+        ('second', 'finished', None),
+    ]
+    # the superseded task is not counted as failed
+    stats = {row[0]: row[1:] for row in tracer.get_span_stats()}
+    assert stats['task.test_running_task_superseded.<locals>.refresh'][:2] == (1, 0)
+
+
+def test_resource_limit():
+    scheduler = TaskScheduler()
+    lock = threading.Lock()
+    running = []
+    max_running = []
+
+    def load():
+        with lock:
+            running.append(1)
+            max_running.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.pop()
+
+    results = []
+    for name in range(4):
+        submit(scheduler, load, results, name, resource=ISSUE_LIST)
+    wait_for_tasks(scheduler)
+    assert max(max_running) == 1
+    assert len(results) == 4
+
+
+def test_error_and_cancel_tasks():
+    scheduler, release = create_blocked_scheduler()
+    results = []
+    owner = object()
+
+    def fail():
+        raise ValueError('Email or token is incorrect')
+
+    submit(scheduler, fail, results, 'fail')
+    scheduler.submit(lambda: None, lambda error_text: None, lambda: results.append('owned'), owner=owner)
+    scheduler.cancel_tasks(owner)
+    release.set()
+    wait_for_tasks(scheduler)
+    assert results == ['owned', ('fail', 'finished', 'Email or token is incorrect')]
+
+
+def test_loading_indicator():
+    # the spinner is deleted with its parent
+    parent = QWidget()
+    indicator = LoadingIndicator(parent)
+    indicator.start()
+    indicator.start()
+    indicator.stop()
+    assert indicator.is_spinning
+    indicator.stop()
+    assert not indicator.is_spinning
+    # extra stops don't make the count negative
+    indicator.stop()
+    indicator.start()
+    assert indicator.is_spinning
+
+
+def test_waiting_tasks_dont_take_threads():
+    scheduler = TaskScheduler()
+    scheduler.pool.setMaxThreadCount(2)
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def refresh():
+        started.set()
+        release.wait(5)
+
+    submit(scheduler, refresh, results, 'refresh', resource=ISSUE_LIST)
+    started.wait(5)
+    for name in ('load more', 'refresh issues'):
+        submit(scheduler, lambda: None, results, name, resource=ISSUE_LIST)
+    # the second thread is free for the tasks of other resources
+    submit(scheduler, lambda: None, results, 'outbox', resource=OUTBOX)
+    deadline = time.monotonic() + 5
+    while not results and time.monotonic() < deadline:
+        app.processEvents()
+    assert results == [('outbox', 'finished', None)]
+
+    # a waiting task is cancelled at once
+    scheduler.cancel(scheduler.waiting[ISSUE_LIST][0])
+    release.set()
+    wait_for_tasks(scheduler)
+    assert results == [
+        ('outbox', 'finished', None),
+        ('load more', 'cancelled'),
+        ('refresh', 'finished', None),
+        ('refresh issues', 'finished', None),
+    ]
+    assert scheduler.free_slots[ISSUE_LIST] == 1
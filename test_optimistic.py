@@ -0,0 +1,34 @@
+from controllers.optimistic import apply_changes, parse_duration, format_duration
+from controllers.outbox import LOG_WORK, TRANSITION_ISSUE
+from issue_record import IssueRecord
+
+
+def test_parse_duration():
+    assert parse_duration('1w 2d 3h 30m') == (5 * 8 + 2 * 8 + 3) * 60 + 30
+    assert parse_duration('1.5h') == 90
+    assert parse_duration('') is None
+    assert parse_duration('1x') is None
+    assert format_duration(8 * 60 + 90) == '1d 1h 30m'
+    assert format_duration(0) == '0m'
+
+
+def test_apply_changes():
+    issue = IssueRecord(
+        'JQR-1',
+        status='To Do',
+        remaining_estimate='2h',
+        time_spent='1h',
+        transitions={'Declare done': ('171', 'Done'), 'Return to Backlog': ('131', 'Backlog')}
+    )
+    changed_issue = apply_changes(issue, [
+        (LOG_WORK, {'time_spent': '30m'}),
+        (LOG_WORK, {'time_spent': '1h', 'adjust_estimate': 'new', 'new_estimate': '4h'}),
+        (TRANSITION_ISSUE, {'transition': '171'}),
+    ])
+    assert changed_issue.time_spent == '2h 30m'
+    assert changed_issue.remaining_estimate == '4h'
+    assert changed_issue.status == 'Done'
+    assert changed_issue.fingerprint != issue.fingerprint
+    assert issue.time_spent == '1h'
+    # the transition is also given by name
+    assert apply_changes(issue, [(TRANSITION_ISSUE, {'transition': 'Return to Backlog'})]).status == 'Backlog'
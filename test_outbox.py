@@ -0,0 +1,114 @@
+import os
+import tempfile
+import threading
+from types import SimpleNamespace
+
+import pytest
+from jira import JIRAError
+
+from controllers.outbox import Outbox, LOG_WORK, TRANSITION_ISSUE
+from controllers.outbox_controller import OutboxController
+
+
+def test_outbox():
+    outbox = Outbox(os.path.join(tempfile.mkdtemp(), 'outbox.sqlite3'))
+    outbox.add('JQR-1', [
+        (LOG_WORK, {'time_spent': '1h'}),
+        (TRANSITION_ISSUE, {'transition': '171'}),
+    ])
+    idempotency_keys = outbox.add('JQR-2', [(LOG_WORK, {'time_spent': '2h'})])
+
+    changes = outbox.get_changes()
+    assert [(change.issue_key, change.action) for change in changes] == [
+        ('JQR-1', LOG_WORK),
+        ('JQR-1', TRANSITION_ISSUE),
+        ('JQR-2', LOG_WORK),
+    ]
+    assert changes[0].params == {'time_spent': '1h'}
+    assert len({change.idempotency_key for change in changes}) == 3
+    assert idempotency_keys == [changes[2].idempotency_key]
+
+    outbox.start_attempt(changes[0].id)
+    outbox.remove(changes[0].id)
+    outbox.set_error(changes[1].id, 'Transition is not valid')
+    changes = outbox.get_changes()
+    assert [(change.attempts, change.error) for change in changes] == [
+        (0, 'Transition is not valid'),
+        (0, None),
+    ]
+
+    outbox.clear_errors()
+    assert [change.error for change in outbox.get_changes()] == [None, None]
+
+
+def test_send_changes():
+    outbox = Outbox(os.path.join(tempfile.mkdtemp(), 'outbox.sqlite3'))
+    outbox.add('JQR-1', [
+        (LOG_WORK, {'time_spent': '1h'}),
+        (TRANSITION_ISSUE, {'transition': '171'}),
+    ])
+    outbox.add('JQR-2', [(LOG_WORK, {'time_spent': '2h'})])
+    outbox.add('JQR-3', [(LOG_WORK, {'time_spent': '3h'})])
+    # every issue waits for the others, so they are sent at the same time
+    barrier = threading.Barrier(3, timeout=5)
+    sent = []
+
+    def log_work(issue_key, **params):
+        barrier.wait()
+        if issue_key == 'JQR-1':
+            raise JIRAError(status_code=400, text='Worklog must not be null')
+        if issue_key == 'JQR-3':
+            raise JIRAError(status_code=503)
+        sent.append(issue_key)
+
+    controller = OutboxController.__new__(OutboxController)
+    controller.outbox = outbox
+    controller.sent_issue_keys = set()
+    controller.jira_client = SimpleNamespace(
+        log_work=log_work,
+        transition_issue=lambda *args, **kwargs: sent.append('transition')
+    )
+    with pytest.raises(JIRAError):
+        controller.send_changes()
+
+    assert sent == ['JQR-2']
+    assert controller.sent_issue_keys == {'JQR-2'}
+    # the transition waits for the failed worklog of its issue
+    changes = outbox.get_changes()
+    assert [(change.issue_key, change.action, change.error) for change in changes] == [
+        ('JQR-1', LOG_WORK, 'Worklog must not be null'),
+        ('JQR-1', TRANSITION_ISSUE, None),
+        ('JQR-3', LOG_WORK, None),
+    ]
+
+
+def test_send_transitions():
+    outbox = Outbox(os.path.join(tempfile.mkdtemp(), 'outbox.sqlite3'))
+    outbox.add('JQR-1', [(TRANSITION_ISSUE, {'transition': 'Declare done', 'status': 'Done'})])
+    outbox.add('JQR-2', [(TRANSITION_ISSUE, {'transition': 'Flag', 'status': 'Flagged'})])
+    # the response of the first attempt was lost
+    outbox.start_attempt(outbox.get_changes()[0].id)
+    transitions = []
+    invalidated = []
+
+    def transition_issue(issue_key, transition, fields=None):
+        transitions.append(issue_key)
+        raise JIRAError('Invalid transition name. {}'.format(transition))
+
+    controller = OutboxController.__new__(OutboxController)
+    controller.outbox = outbox
+    controller.sent_issue_keys = set()
+    controller.jira_client = SimpleNamespace(
+        get_status=lambda issue_key: 'Done',
+        transition_issue=transition_issue,
+        invalidate_transitions=invalidated.append
+    )
+    controller.send_changes()
+
+    # the issue is in the target status already, so the transition is not sent again
+    assert transitions == ['JQR-2']
+    assert controller.sent_issue_keys == {'JQR-1'}
+    assert invalidated == ['JQR-2']
+    assert [(change.issue_key, change.error) for change in outbox.get_changes()] == [
+        ('JQR-2', 'Invalid transition name. Flag'),
+    ]
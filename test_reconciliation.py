@@ -0,0 +1,59 @@
+from controllers.reconciliation import reconcile, INSERT, UPDATE, MOVE, DELETE
+from issue_record import IssueRecord
+
+
+def get_issue(key, summary='title'):
+    return IssueRecord(key, summary)
+
+
+def get_fingerprints(issues):
+    return {issue.key: issue.fingerprint for issue in issues}
+
+
+def test_reconcile():
+    current_issues = [get_issue('JQR-1'), get_issue('JQR-2'), get_issue('JQR-3')]
+    issues = [
+        get_issue('JQR-3', 'new title'),
+        get_issue('JQR-4'),
+        get_issue('JQR-1'),
+    ]
+    operations = reconcile(
+        [issue.key for issue in current_issues],
+        get_fingerprints(current_issues),
+        issues,
+        get_fingerprints(issues)
+    )
+
+    assert operations == [
+        (DELETE, 'JQR-2'),
+        (INSERT, 2, issues[1]),
+        (MOVE, 'JQR-1', 2),
+        (UPDATE, issues[0]),
+    ]
+
+
+def test_reconcile_unchanged():
+    issues = [get_issue('JQR-1'), get_issue('JQR-2')]
+    fingerprints = get_fingerprints(issues)
+    assert reconcile(['JQR-1', 'JQR-2'], fingerprints, issues, fingerprints) == []
+
+
+def apply_operations(keys, operations):
+    keys = list(keys)
+    for operation in operations:
+        if operation[0] == DELETE:
+            keys.remove(operation[1])
+        elif operation[0] == INSERT:
+            keys.insert(operation[1], operation[2].key)
+        elif operation[0] == MOVE:
+            keys.remove(operation[1])
+            keys.insert(operation[2], operation[1])
+    return keys
+
+
+def test_reconcile_reorder():
+    current_keys = ['JQR-{}'.format(number) for number in range(1, 200)]
+    issues = [get_issue(key) for key in current_keys[::-3] + ['JQR-500'] + current_keys[1::3]]
+    current_fingerprints = get_fingerprints([get_issue(key) for key in current_keys])
+    operations = reconcile(current_keys, current_fingerprints, issues, get_fingerprints(issues))
+    assert apply_operations(current_keys, operations) == [issue.key for issue in issues]
@@ -0,0 +1,38 @@
+import time
+
+from controllers.refresh_schedule import RefreshSchedule
+from config import (
+    REFRESH_TIME,
+    MAX_REFRESH_TIME,
+    HIDDEN_REFRESH_TIME,
+    CHANGES_REFRESH_TIME,
+    REFRESH_JITTER
+)
+
+
+def in_jitter(interval, expected):
+    return expected * (1 - REFRESH_JITTER) <= interval <= expected * (1 + REFRESH_JITTER)
+
+
+def test_refresh_schedule():
+    schedule = RefreshSchedule()
+    assert schedule.is_due()
+    schedule.refreshed(changed=True)
+    assert not schedule.is_due()
+    assert in_jitter(schedule.get_next_interval(visible=True), REFRESH_TIME)
+    assert in_jitter(schedule.get_next_interval(visible=False), HIDDEN_REFRESH_TIME)
+
+    for _ in range(10):
+        schedule.refreshed(changed=False)
+    assert in_jitter(schedule.get_next_interval(visible=True), MAX_REFRESH_TIME)
+
+    schedule.changes_sent()
+    assert in_jitter(schedule.get_next_interval(visible=True), CHANGES_REFRESH_TIME)
+    schedule.refreshed(changed=True)
+    assert in_jitter(schedule.get_next_interval(visible=True), REFRESH_TIME)
+
+
+def test_refresh_schedule_throttled():
+    schedule = RefreshSchedule()
+    throttled_until = time.monotonic() + MAX_REFRESH_TIME * 2 / 1000
+    assert schedule.get_next_interval(True, throttled_until) > MAX_REFRESH_TIME
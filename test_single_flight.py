@@ -0,0 +1,46 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_single_flight():
+    single_flight = SingleFlight('searches')
+    calls = []
+
+    def search(query):
+        calls.append(query)
+        time.sleep(0.1)
+        return [query]
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(
+            lambda query: single_flight.call(query, search, query),
+            ['project = JQR'] * 3 + ['project = ABC']
+        ))
+    assert results == [['project = JQR']] * 3 + [['project = ABC']]
+    assert sorted(calls) == ['project = ABC', 'project = JQR']
+    # a finished call is not cached
+    single_flight.call('project = JQR', search, 'project = JQR')
+    assert len(calls) == 3
+
+
+def test_single_flight_error():
+    single_flight = SingleFlight('searches')
+    started = threading.Event()
+
+    def search():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError('bad query')
+
+    with ThreadPoolExecutor(2) as executor:
+        first = executor.submit(single_flight.call, 'bad', search)
+        started.wait()
+        second = executor.submit(single_flight.call, 'bad', search)
+        for future in (first, second):
+            with pytest.raises(ValueError):
+                future.result()
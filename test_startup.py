@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+# modules of the windows which are opened after the main window
+DEFERRED_MODULES = {
+    'PyQt5.QtMultimedia',
+    'pomodoro_window',
+    'time_log_window',
+    'workflow_window',
+    'controllers.time_log_controller',
+    'controllers.workflow_controller',
+    'stats_window',
+}
+# ms for all imports of app.py, the same as `python -X importtime app.py` shows
+IMPORT_TIME_BUDGET = 1000
+
+
+def get_import_times(module):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stderr=subprocess.PIPE,
+        universal_newlines=True
+    )
+    import_times = dict()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            self_time, cumulative_time, name = line[len('import time:'):].split('|')
+            if cumulative_time.strip().isdigit():
+                import_times[name.strip()] = int(cumulative_time) / 1000
+    return import_times
+
+
+def test_startup_imports():
+    import_times = get_import_times('app')
+    assert not DEFERRED_MODULES & set(import_times)
+    assert import_times['app'] < IMPORT_TIME_BUDGET
@@ -1,27 +1,15 @@
 from jiraclient import JiraClient
+from issue_record import IssueRecord
 import unittest
-from types import SimpleNamespace as sn
 
 
 class Test(unittest.TestCase):
     def test_get_remaining_estimate_empty(self):
-        issue = sn(
-            fields=sn(
-                timetracking=sn(
-                    raw={}
-                )
-            )
-        )
+        issue = IssueRecord('JQR-1')
         self.assertEqual(JiraClient.get_remaining_estimate(issue), '0m')
 
     def test_get_remaining_estimate(self):
-        issue = sn(
-            fields=sn(
-                timetracking=sn(
-                    raw={'remainingEstimate': '1h'}
-                )
-            )
-        )
+        issue = IssueRecord('JQR-1', remaining_estimate='1h')
         self.assertEqual(JiraClient.get_remaining_estimate(issue), '1h')
 
 
@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+
+import pytest
+
+from tracing import Tracer, get_percentile
+
+
+def test_get_percentile():
+    durations = list(range(1, 101))
+    assert get_percentile(durations, 50) == 51
+    assert get_percentile(durations, 95) == 95
+    assert get_percentile([7], 95) == 7
+
+
+def test_tracer():
+    tracer = Tracer()
+    for duration in (10, 20, 30):
+        tracer.add_span('jira.get_issues', 0, duration)
+    with pytest.raises(ValueError):
+        with tracer.span('jira.log_work'):
+            raise ValueError('bad worklog')
+    tracer.count_cache('transitions', True)
+    tracer.count_cache('transitions', True)
+    tracer.count_cache('transitions', False)
+
+    stats = {row[0]: row[1:] for row in tracer.get_span_stats()}
+    assert stats['jira.get_issues'] == (3, 0, 20, 30, 30)
+    assert stats['jira.log_work'][:2] == (1, 1)
+    assert tracer.get_cache_stats() == [('transitions', 2, 1, 2 / 3)]
+
+    path = os.path.join(tempfile.mkdtemp(), 'trace.jsonl')
+    assert tracer.export(path) == 4
+    # exported spans are not written again, the stats are kept
+    assert tracer.export(path) == 0
+    with open(path, encoding='utf-8') as file:
+        spans = [json.loads(line) for line in file]
+    assert [span['name'] for span in spans] == ['jira.get_issues'] * 3 + ['jira.log_work']
+    assert spans[-1]['error'] == 'ValueError: bad worklog'
+    assert tracer.get_span_stats()[0][1] == 3
+
+
+def test_ignored_errors():
+    tracer = Tracer()
+    with pytest.raises(KeyError):
+        with tracer.span('task.refresh', ignored=(KeyError,)):
+            raise KeyError('JQR-1')
+    assert tracer.get_span_stats()[0][:3] == ('task.refresh', 1, 0)
+
+
+def test_failed_export_keeps_spans():
+    tracer = Tracer()
+    tracer.add_span('jira.get_issues', 0, 10)
+    directory = tempfile.mkdtemp()
+    with pytest.raises(OSError):
+        tracer.export(directory)
+    tracer.add_span('jira.log_work', 0, 20)
+
+    path = os.path.join(directory, 'trace.jsonl')
+    assert tracer.export(path) == 2
+    assert tracer.export(path) == 0
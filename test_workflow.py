@@ -1,22 +1,24 @@
 from controllers.main_controller import MainController
+from controllers.outbox import TRANSITION_ISSUE, UPDATE_ISSUE
+from controllers.workflow_controller import WorkflowController
+from issue_record import IssueRecord
 from types import SimpleNamespace as sn
 
+from PyQt5.QtWidgets import QApplication
+
+# the controller creates its windows
+app = QApplication.instance() or QApplication([])
+
 
 def test_posiible_workflows():
-    issue = sn(
-        fields=sn(
-            status=sn(
-                name='Selected for development'
-            )
-        )
-    )
+    issue = sn(status='Selected for development')
     issues = {}
     issues['issue_obj'] = issue
     issues['workflow'] = {
-        'Return to Backlog': '131',
-        'Selected for development': '51',
-        'Declare done': '171',
-        'Flag': '181'
+        'Return to Backlog': ('131', 'Backlog'),
+        'Selected for development': ('51', 'Selected for development'),
+        'Declare done': ('171', 'Done'),
+        'Flag': ('181', 'Flagged')
     }
 
     assert MainController(None).get_possible_workflows(issues) == [
@@ -29,20 +31,14 @@ def test_posiible_workflows():
 
 
 def test_posiible_workflows_with_backlog():
-    issue = sn(
-        fields=sn(
-            status=sn(
-                name='Backlog'
-            )
-        )
-    )
+    issue = sn(status='Backlog')
     issues = {}
     issues['issue_obj'] = issue
     issues['workflow'] = {
-        'Return to Backlog': '131',
-        'Selected for development': '51',
-        'Declare done': '171',
-        'Flag': '181'
+        'Return to Backlog': ('131', 'Backlog'),
+        'Selected for development': ('51', 'Selected for development'),
+        'Declare done': ('171', 'Done'),
+        'Flag': ('181', 'Flagged')
     }
 
     assert MainController(None).get_possible_workflows(issues) == [
@@ -51,3 +47,11 @@ def test_posiible_workflows_with_backlog():
         'Declare done',
         'Flag'
     ]
+
+
+def test_workflow_changes_of_unassigned_issue():
+    controller = WorkflowController(None, IssueRecord('JQR-1'), '171', '0m', '1h', None, None)
+    assert controller.view.assignee_line.text() == ''
+    changes = controller.get_changes()
+    assert [action for action, params in changes] == [UPDATE_ISSUE, TRANSITION_ISSUE]
+    assert 'assignee' not in changes[0][1]['fields']
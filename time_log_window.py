@@ -13,7 +13,6 @@ from PyQt5.QtWidgets import (
 )
 
 from center_window import CenterWindow
-from config import QSS
 
 
 class TimeLogWindow(CenterWindow):
@@ -23,7 +22,7 @@ class TimeLogWindow(CenterWindow):
         self.issue_key = issue_key
         self.time_spent = time_spent
         self.controller = controller
-        self.setStyleSheet(QSS)
+        self.set_style()
         self.resize(600, 450)
         self.setWindowTitle('Log Work: {issue}'.format(issue=issue_key))
 
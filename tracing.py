@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from collections import deque, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+from config import TRACE_PATH, TRACE_SPANS_LIMIT, TRACE_DURATIONS_LIMIT
+
+
+def get_percentile(durations, percent):
+    durations = sorted(durations)
+    return durations[round((len(durations) - 1) * percent / 100)]
+
+
+class Tracer:
+    """
+    Records how long requests, tasks and view updates take and how often
+    the caches are hit. Spans are kept until they are exported
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.spans = deque(maxlen=TRACE_SPANS_LIMIT)
+        # the latest durations in ms and the number of calls and errors by span name
+        self.durations = defaultdict(lambda: deque(maxlen=TRACE_DURATIONS_LIMIT))
+        self.counts = defaultdict(int)
+        self.errors = defaultdict(int)
+        # (hits, misses) by cache name
+        self.cache_counts = defaultdict(lambda: [0, 0])
+
+    @contextmanager
+    def span(self, name, ignored=()):
+        """
+        Record the block as a span. Exceptions of the ignored types
+        are raised further but are not counted as errors
+        """
+
+        started_at = time.time()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except ignored:
+            raise
+        except BaseException as ex:
+            error = '{}: {}'.format(type(ex).__name__, ex)
+            raise
+        finally:
+            self.add_span(name, started_at, (time.perf_counter() - start) * 1000, error)
+
+    def add_span(self, name, started_at, duration, error=None):
+        with self.lock:
+            self.spans.append(dict(
+                name=name,
+                started_at=started_at,
+                duration=round(duration, 3),
+                thread=threading.current_thread().name,
+                error=error
+            ))
+            self.durations[name].append(duration)
+            self.counts[name] += 1
+            if error is not None:
+                self.errors[name] += 1
+
+    def count_cache(self, name, hit):
+        with self.lock:
+            self.cache_counts[name][0 if hit else 1] += 1
+
+    def get_span_stats(self):
+        """
+        Return [(name, count, errors, p50, p95, max)] with durations in ms
+        """
+
+        with self.lock:
+            durations = {name: list(values) for name, values in self.durations.items()}
+            counts = dict(self.counts)
+            errors = dict(self.errors)
+        return [
+            (
+                name,
+                counts[name],
+                errors.get(name, 0),
+                get_percentile(values, 50),
+                get_percentile(values, 95),
+                max(values)
+            )
+            for name, values in sorted(durations.items())
+        ]
+
+    def get_cache_stats(self):
+        """
+        Return [(name, hits, misses, hit rate)]
+        """
+
+        with self.lock:
+            cache_counts = {name: tuple(counts) for name, counts in self.cache_counts.items()}
+        return [
+            (name, hits, misses, hits / (hits + misses))
+            for name, (hits, misses) in sorted(cache_counts.items())
+        ]
+
+    def export(self, path=TRACE_PATH):
+        """
+        Append the spans recorded since the last export to the JSONL file.
+        Return the number of exported spans
+        """
+
+        with self.lock:
+            spans = list(self.spans)
+        lines = ''.join(json.dumps(span) + '\n' for span in spans)
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(lines)
+        # the spans are kept if the file can't be written. New spans are
+        # added after the exported ones, and the oldest ones may be dropped
+        exported = {id(span) for span in spans}
+        with self.lock:
+            while self.spans and id(self.spans[0]) in exported:
+                self.spans.popleft()
+        return len(spans)
+
+
+def traced(name):
+    """
+    Decorator which records every call of the function as a span
+    """
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_callback_name(callback):
+    # tasks are usually given as partial objects
+    callback = getattr(callback, 'func', callback)
+    return getattr(callback, '__qualname__', None) or repr(callback)
+
+
+tracer = Tracer()